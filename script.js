@@ -312,6 +312,168 @@ window.generateSkeleton = function(count = 6) {
     `;
 };
 
+// Feed 中的计数为数字（schemaVersion 2，见 scripts/records.py），显示时再加千分位；旧版 feed 的字符串原样显示
+window.formatCount = function(value) {
+    if (value === null || value === undefined || value === '') return '';
+    return typeof value === 'number' ? value.toLocaleString('en-US') : String(value);
+};
+
+// 增量 Feed 加载：在 localStorage 中保存上次的数据及版本号，之后只下载新增的增量文件（格式见 scripts/delta.py）
+function feedItemIds(items, key) {
+    const seen = {};
+    return items.map(item => {
+        const value = item[key];
+        seen[value] = (seen[value] || 0) + 1;
+        return seen[value] === 1 ? value : `${value}#${seen[value]}`;
+    });
+}
+
+function feedListKey(items, idKeys) {
+    if (!Array.isArray(items) || items.length === 0) return null;
+    if (!items.every(item => item && typeof item === 'object' && !Array.isArray(item))) return null;
+    return idKeys.find(key => items.every(item => typeof item[key] === 'string')) || null;
+}
+
+function feedChild(container, segment, idKeys) {
+    if (!Array.isArray(container)) return container[segment];
+    const index = feedItemIds(container, feedListKey(container, idKeys)).indexOf(segment);
+    if (index < 0) throw new Error(`增量数据中找不到条目 ${segment}`);
+    return container[index];
+}
+
+function applyFeedDelta(data, ops, idKeys) {
+    for (const op of ops) {
+        const path = op.path;
+        if (op.op === 'set' && path.length === 0) {
+            data = op.value;
+            continue;
+        }
+        let parent = data;
+        for (const segment of path.slice(0, -1)) parent = feedChild(parent, segment, idKeys);
+        const target = path[path.length - 1];
+        if (op.op === 'set') {
+            if (Array.isArray(parent)) {
+                parent[feedItemIds(parent, feedListKey(parent, idKeys)).indexOf(target)] = op.value;
+            } else {
+                parent[target] = op.value;
+            }
+        } else if (op.op === 'remove') {
+            delete parent[target];
+        } else if (op.op === 'list') {
+            const items = path.length ? feedChild(parent, target, idKeys) : parent;
+            const removed = new Set(op.removed);
+            const moved = new Map(op.moved);
+            const result = new Array(items.length - removed.size + op.added.length).fill(undefined);
+            const rest = [];
+            feedItemIds(items, op.key).forEach((id, i) => {
+                if (moved.has(id)) result[moved.get(id)] = items[i];
+                else if (!removed.has(id)) rest.push(items[i]);
+            });
+            op.added.forEach(([i, item]) => { result[i] = item; });
+            let next = 0;
+            items.splice(0, items.length, ...result.map(slot => (slot === undefined ? rest[next++] : slot)));
+        } else {
+            throw new Error(`未知的增量操作 ${op.op}`);
+        }
+    }
+    return data;
+}
+
+async function feedChecksum(text) {
+    if (!window.crypto || !window.crypto.subtle) return null;
+    const digest = await window.crypto.subtle.digest('SHA-1', new TextEncoder().encode(text));
+    return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+}
+
+// 与 scripts/artifacts.py 写出的精简版本对应；msgpack 版本供其他程序使用，页面不读取
+const FEED_FORMATS = {
+    br: { suffix: '.min.json.br', encoding: 'brotli' },
+    gz: { suffix: '.min.json.gz', encoding: 'gzip' },
+    min: { suffix: '.min.json', encoding: null },
+};
+
+function feedFormatSupported(format) {
+    const encoding = FEED_FORMATS[format].encoding;
+    if (!encoding) return true;
+    if (typeof DecompressionStream === 'undefined') return false;
+    try {
+        new DecompressionStream(encoding);
+        return true;
+    } catch (e) {
+        return false;
+    }
+}
+
+async function fetchFeedText(url, encoding) {
+    const res = await fetch(url, { cache: 'no-store' });
+    if (!res.ok) throw new Error(`无法加载 ${url}`);
+    // GitHub Pages 把 .gz/.br 当作普通文件返回，需要自己解压；若服务器已按 Content-Encoding 解压过则直接读取
+    if (!encoding || res.headers.get('Content-Encoding')) return res.text();
+    return new Response(res.body.pipeThrough(new DecompressionStream(encoding))).text();
+}
+
+window.loadFeed = async function(name) {
+    const dir = `feeds/deltas/${name.replace(/\.json$/, '')}`;
+    const storageKey = `feed:${name}`;
+    const save = (version, data) => {
+        try {
+            localStorage.setItem(storageKey, JSON.stringify({ version, data }));
+        } catch (e) { /* 存储空间不足时下次重新下载完整数据 */ }
+    };
+    let cached = null;
+    let manifest = null;
+    try {
+        cached = JSON.parse(localStorage.getItem(storageKey));
+    } catch (e) { cached = null; }
+    try {
+        const res = await fetch(`${dir}/manifest.json`, { cache: 'no-store' });
+        if (res.ok) manifest = await res.json();
+    } catch (e) { manifest = null; }
+
+    if (manifest && cached && cached.version === manifest.version) return cached.data;
+    if (manifest && cached && cached.version >= manifest.base && cached.version < manifest.version) {
+        try {
+            const versions = manifest.deltas.map(d => d.version).filter(v => v > cached.version);
+            const deltas = await Promise.all(versions.map(async v => {
+                const res = await fetch(`${dir}/${v}.json`, { cache: 'no-cache' });
+                if (!res.ok) throw new Error(`无法加载 ${dir}/${v}.json`);
+                return res.json();
+            }));
+            let data = cached.data;
+            for (const delta of deltas) data = applyFeedDelta(data, delta.ops, manifest.idKeys);
+            save(manifest.version, data);
+            return data;
+        } catch (e) {
+            console.warn(`增量更新 ${name} 失败，改为下载完整数据`, e);
+        }
+    }
+
+    // 清单列出了精简版本时，先下载浏览器能解压的最小文件，失败则依次退回到更大的版本
+    const artifacts = manifest && manifest.artifacts;
+    const formats = artifacts ? Object.keys(FEED_FORMATS)
+        .filter(f => f in artifacts.bytes && feedFormatSupported(f))
+        .sort((a, b) => artifacts.bytes[a] - artifacts.bytes[b]) : [];
+    for (const format of formats) {
+        try {
+            const text = await fetchFeedText(`feeds/${name.replace(/\.json$/, '')}${FEED_FORMATS[format].suffix}`,
+                                             FEED_FORMATS[format].encoding);
+            const data = JSON.parse(text);
+            if (artifacts.checksum === await feedChecksum(text)) save(manifest.version, data);
+            return data;
+        } catch (e) {
+            console.warn(`无法加载 ${name} 的 ${format} 版本`, e);
+        }
+    }
+
+    const res = await fetch(`feeds/${name}`, { cache: 'no-store' });
+    if (!res.ok) throw new Error(`无法加载 feeds/${name}`);
+    const text = await res.text();
+    const data = JSON.parse(text);
+    // 只有确认下载到的正是清单所描述的版本时才缓存，避免把更新过的文件当作旧版本打补丁
+    if (manifest && manifest.checksum === await feedChecksum(text)) save(manifest.version, data);
+    return data;
+};
+
 // 页面加载完成后的初始化
 document.addEventListener('DOMContentLoaded', () => {
     // 为标题添加打字机效果
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Rising lists computed from consecutive snapshots.
+
+After the scrapers have run, fetch_all.py compares this run's snapshots
+(snapshots.py) of each group in RISING_FEEDS with the previous run that
+captured the same group, and scraper_rising.py writes feeds/rising-<group>.json:
+
+  {"feed", "metric", "lastUpdated", "since", "hours", "totalTracked",
+   "items": [{"url", "value", "delta", "perHour", "acceleration",
+              "rank", "rankChange"}, ...]}
+
+value is the item's metric now (its best value over the group's sources,
+e.g. a repository's stars wherever it trends), delta the change since the
+previous run and perHour that change divided by the hours in between.
+acceleration is the change of perHour against the run before (per hour²),
+rank the item's best rank now and rankChange how many places it climbed.
+Items are ordered by perHour; only items present in both runs are ranked.
+
+Every metric is pulled from the store as one array per run, items are
+aligned with a sorted search over the previous run's ids and all arithmetic
+is done on NumPy arrays, so the cost stays close to a few sorts however many
+repositories and models are tracked. NumPy is imported on first use; without
+it the rising lists are skipped.
+"""
+
+import importlib.util
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from snapshots import SnapshotStore
+
+# group (a snapshot source prefix) -> metric the list is ranked by
+RISING_FEEDS = {'github': 'stars', 'huggingface': 'downloads', 'papers': 'upvotes'}
+DEFAULT_RISING_LIMIT = 50
+
+
+def numpy_available() -> bool:
+    return importlib.util.find_spec('numpy') is not None
+
+
+def _arrays(store: SnapshotStore, group: str, metric: str, run: int, best: str = 'max'):
+    """(ids, values) of one run as NumPy arrays sorted by id; an item in several sources keeps its best value
+    (best='max' for counts, 'min' for ranks)."""
+    import numpy as np
+    rows = store.group_values(group, metric, run)
+    ids = np.array([item for item, _ in rows], dtype=str)
+    values = np.array([value for _, value in rows], dtype=np.float64)
+    if not len(ids):
+        return ids, values
+    order = np.argsort(ids, kind='stable')
+    ids, values = ids[order], values[order]
+    ids, starts = np.unique(ids, return_index=True)
+    reduce = np.maximum if best == 'max' else np.minimum
+    return ids, reduce.reduceat(values, starts)
+
+
+def _align(ids, other_ids, other_values):
+    """other_values at the positions of ids (NaN where an id is missing from other_ids)."""
+    import numpy as np
+    result = np.full(len(ids), np.nan)
+    if not len(other_ids) or not len(ids):
+        return result
+    pos = np.searchsorted(other_ids, ids)
+    pos[pos == len(other_ids)] = 0
+    found = other_ids[pos] == ids
+    result[found] = other_values[pos[found]]
+    return result
+
+
+def _hours(later: str, earlier: str) -> float:
+    return (datetime.fromisoformat(later) - datetime.fromisoformat(earlier)).total_seconds() / 3600
+
+
+def _number(value: float) -> Optional[float]:
+    """A JSON-friendly number: None for NaN, an int when whole."""
+    if value != value:
+        return None
+    return int(value) if float(value).is_integer() else round(float(value), 3)
+
+
+def rising(store: SnapshotStore, group: str, metric: str, limit: int = DEFAULT_RISING_LIMIT,
+           run: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """The rising list of group in run (default: the store's current run), or None without an earlier run to compare with."""
+    import numpy as np
+    runs = store.group_runs(group, until=run, limit=3)
+    if len(runs) < 2 or (run is not None and runs[0][0] != run):
+        return None
+    (current, now), (previous, then) = runs[:2]
+    hours = _hours(now, then)
+    if hours <= 0:
+        return None
+    ids, values = _arrays(store, group, metric, current)
+    prev_values = _align(ids, *_arrays(store, group, metric, previous))
+    per_hour = (values - prev_values) / hours
+    acceleration = np.full(len(ids), np.nan)
+    if len(runs) > 2:
+        older, before = runs[2]
+        earlier_hours = _hours(then, before)
+        if earlier_hours > 0:
+            older_values = _align(ids, *_arrays(store, group, metric, older))
+            acceleration = (per_hour - (prev_values - older_values) / earlier_hours) / hours
+    ranks = _align(ids, *_arrays(store, group, 'rank', current, best='min'))
+    rank_change = _align(ids, *_arrays(store, group, 'rank', previous, best='min')) - ranks
+
+    tracked = np.flatnonzero(~np.isnan(per_hour))
+    # Fastest growth first, then the biggest climb; NaN climbs (no rank) sort last
+    climb = np.nan_to_num(rank_change[tracked], nan=-np.inf)
+    top = tracked[np.lexsort((-climb, -per_hour[tracked]))][:limit]
+    return {
+        'feed': group, 'metric': metric, 'lastUpdated': now, 'since': then, 'hours': round(hours, 2),
+        'totalTracked': int(len(tracked)),
+        'items': [{'url': str(ids[i]), 'value': _number(values[i]), 'delta': _number(values[i] - prev_values[i]),
+                   'perHour': _number(per_hour[i]), 'acceleration': _number(acceleration[i]),
+                   'rank': _number(ranks[i]), 'rankChange': _number(rank_change[i])} for i in top],
+    }
+
+
+def rising_feeds(store: SnapshotStore, limit: int = DEFAULT_RISING_LIMIT) -> List[Tuple[str, Dict[str, Any]]]:
+    """(filename, rising list) of every RISING_FEEDS group recorded in the store's current run."""
+    recorded = {source.split('/', 1)[0] for source in store.sources_recorded}
+    feeds = []
+    for group, metric in RISING_FEEDS.items():
+        if group not in recorded:
+            continue
+        result = rising(store, group, metric, limit)
+        if result is not None:
+            feeds.append((f"rising-{group}.json", result))
+    return feeds
+
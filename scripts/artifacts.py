@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Compact, precompressed variants of the JSON feeds.
+
+The feeds themselves stay pretty-printed (they are diffed in git and read by
+people), but GitHub Pages only compresses what its CDN decides to, so next to
+every feeds/<name>.json that BaseScraper writes ArtifactWriter also puts:
+
+  <name>.min.json       the same document without whitespace
+  <name>.min.json.gz    gzip -9 of it (mtime 0, so unchanged feeds give
+                        unchanged bytes and no git diff)
+  <name>.min.json.br    brotli -q 11 of it, when the brotli module is installed
+  <name>.msgpack        MessagePack of the document, only when asked for and
+                        the msgpack module is installed; for API consumers,
+                        the pages do not read it
+
+A format that is not written this time is deleted, so no variant is ever left
+behind describing an older feed. publish() returns
+
+  {"checksum": sha1 of the .min.json text, "bytes": {"json": n, "min": n, "gz": n, ...}}
+
+which DeltaPublisher stores as "artifacts" in the feed's delta manifest;
+script.js loadFeed reads it there and downloads the smallest variant the
+browser can decode (DecompressionStream for gz and br), falling back to the
+next one and finally to the pretty feed.
+
+Streamed feeds (write_output_stream) write their .min.json alongside the
+pretty file and are compressed from it in chunks by publish_file(); they get
+no MessagePack variant, since that would need the whole document in memory.
+
+The variants are not committed (.gitignore): the pretty feeds are, and the
+Pages deploy (.github/workflows/deploy.yml) rebuilds the variants from them,
+so git history does not grow by a set of compressed copies on every run. The
+rebuilt .min.json has the checksum the delta manifest recorded at fetch time:
+
+  python3 scripts/artifacts.py feeds [--formats gz,br]
+"""
+
+import argparse
+import glob
+import gzip
+import importlib.util
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+from delta import DeltaPublisher, checksum
+
+# Optional formats besides .min.json, in the order they are written
+FORMATS = ('msgpack', 'gz', 'br')
+DEFAULT_FORMATS = ('gz', 'br')
+SUFFIXES = {'min': '.min.json', 'gz': '.min.json.gz', 'br': '.min.json.br', 'msgpack': '.msgpack'}
+MODULES = {'br': 'brotli', 'msgpack': 'msgpack'}
+CHUNK_SIZE = 1 << 16
+
+
+def compact(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def available(fmt: str) -> bool:
+    """Whether the module fmt needs (if any) is installed."""
+    module = MODULES.get(fmt)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def artifact_path(path: str, fmt: str) -> str:
+    """feeds/<name><suffix> of the variant fmt of the feed file at path."""
+    return os.path.splitext(path)[0] + SUFFIXES[fmt]
+
+
+def remove_artifacts(path: str, keep: Sequence[str] = ()):
+    """Delete the variants of the feed at path except those in keep."""
+    for fmt in SUFFIXES:
+        if fmt not in keep:
+            try:
+                os.remove(artifact_path(path, fmt))
+            except FileNotFoundError:
+                pass
+
+
+class _Compressor:
+    """Incremental gzip or brotli compression into a temporary file, replaced atomically by close()."""
+
+    def __init__(self, fmt: str, path: str):
+        self.path = path
+        self.tmp = path + '.tmp'
+        self._file = open(self.tmp, 'wb')
+        if fmt == 'gz':
+            self._gzip = gzip.GzipFile(fileobj=self._file, mode='wb', compresslevel=9, mtime=0, filename='')
+            self._brotli = None
+        else:
+            import brotli
+            self._gzip = None
+            self._brotli = brotli.Compressor(mode=brotli.MODE_TEXT, quality=11)
+
+    def write(self, chunk: bytes):
+        if self._gzip:
+            self._gzip.write(chunk)
+        else:
+            self._file.write(self._brotli.process(chunk))
+
+    def close(self) -> int:
+        if self._gzip:
+            self._gzip.close()
+        else:
+            self._file.write(self._brotli.finish())
+        self._file.close()
+        os.replace(self.tmp, self.path)
+        return os.path.getsize(self.path)
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self.tmp):
+            os.remove(self.tmp)
+
+
+class ArtifactWriter:
+    def __init__(self, formats: Sequence[str] = DEFAULT_FORMATS):
+        # Formats whose module is missing are dropped (fetch_all.py says so)
+        self.formats = tuple(fmt for fmt in FORMATS if fmt in formats and available(fmt))
+        self._lock = threading.Lock()
+        # feed file name -> bytes per format ('json' is the pretty feed)
+        self.written: Dict[str, Dict[str, int]] = {}
+
+    def publish(self, path: str, data: Any, size: Optional[int] = None) -> Dict[str, Any]:
+        """Write the variants of the feed file at path, whose document is data (size: its bytes, if known)."""
+        text = compact(data)
+        encoded = text.encode('utf-8')
+        sizes = {'json': size if size is not None else os.path.getsize(path), 'min': len(encoded)}
+        _write_bytes(artifact_path(path, 'min'), encoded)
+        for fmt in self.formats:
+            if fmt == 'msgpack':
+                import msgpack
+                payload = msgpack.packb(data, use_bin_type=True)
+                _write_bytes(artifact_path(path, fmt), payload)
+                sizes[fmt] = len(payload)
+            else:
+                sizes[fmt] = self._compress(path, fmt, [encoded])
+        remove_artifacts(path, keep=sizes)
+        self._record(path, sizes)
+        return {'checksum': checksum(text), 'bytes': sizes}
+
+    def publish_file(self, path: str) -> Dict[str, int]:
+        """Compress the .min.json already written next to the feed file at path (see write_output_stream)."""
+        min_path = artifact_path(path, 'min')
+        sizes = {'json': os.path.getsize(path), 'min': os.path.getsize(min_path)}
+        for fmt in self.formats:
+            if fmt != 'msgpack':
+                with open(min_path, 'rb') as f:
+                    sizes[fmt] = self._compress(path, fmt, iter(lambda: f.read(CHUNK_SIZE), b''))
+        remove_artifacts(path, keep=sizes)
+        self._record(path, sizes)
+        return sizes
+
+    @staticmethod
+    def _compress(path: str, fmt: str, chunks) -> int:
+        out = _Compressor(fmt, artifact_path(path, fmt))
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+            return out.close()
+        except BaseException:
+            out.discard()
+            raise
+
+    def _record(self, path: str, sizes: Dict[str, int]):
+        with self._lock:
+            self.written[os.path.basename(path)] = sizes
+
+    def summary(self) -> Dict[str, int]:
+        """Bytes over all feeds written this run: the pretty feeds and each format."""
+        with self._lock:
+            total: Dict[str, int] = {}
+            for sizes in self.written.values():
+                for fmt, size in sizes.items():
+                    total[fmt] = total.get(fmt, 0) + size
+            return total
+
+
+def smallest(sizes: Dict[str, int]) -> str:
+    """The format with the fewest bytes among those the pages can read (not msgpack)."""
+    return min((fmt for fmt in sizes if fmt != 'msgpack'), key=lambda fmt: sizes[fmt])
+
+
+def _write_bytes(path: str, payload: bytes):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def publish_directory(directory: str, formats: Sequence[str] = DEFAULT_FORMATS) -> ArtifactWriter:
+    """Write the variants of every feed in directory from its pretty file, as fetch_all.py would have."""
+    writer = ArtifactWriter(formats)
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        if path.endswith(SUFFIXES['min']):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        result = writer.publish(path, data)
+        manifest = os.path.join(DeltaPublisher.directory(path), 'manifest.json')
+        if os.path.exists(manifest):
+            with open(manifest, 'r', encoding='utf-8') as f:
+                recorded = (json.load(f).get('artifacts') or {}).get('checksum')
+            if recorded and recorded != result['checksum']:
+                print(f"  {os.path.basename(path)}: .min.json differs from the delta manifest; pages will not cache it")
+    return writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the compact and precompressed variants of every feed in a directory")
+    parser.add_argument('directory', help="Feed directory, e.g. feeds")
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS), metavar='LIST',
+                        help=f"Formats besides .min.json ({', '.join(FORMATS)}; default: {','.join(DEFAULT_FORMATS)})")
+    args = parser.parse_args()
+    formats = [fmt for fmt in args.formats.split(',') if fmt]
+    for fmt in formats:
+        if fmt not in FORMATS:
+            parser.error(f"unknown format '{fmt}'")
+        if not available(fmt):
+            print(f"{fmt} needs the {MODULES[fmt]} module; skipped")
+    writer = publish_directory(args.directory, formats)
+    total = writer.summary()
+    print(f"Compact feeds: {len(writer.written)} feeds, "
+          + ', '.join(f"{fmt} {size / 1024:.1f} KB" for fmt, size in total.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark suite.
+
+Runs every scraper parser against the saved pages in fixtures/pages/ at
+several scales (the cards between <!--bench:repeat--> markers are repeated,
+JSON lists are multiplied) and reports items/sec, time per page and memory.
+
+Each case runs in a fresh child process, which reports its peak RSS and how
+far parsing raised it above the peak reached while loading the page; unlike
+tracemalloc this includes what lxml/libxml2 allocate in C.
+
+Timings are machine-dependent, so each child also times a fixed reference
+workload (stdlib HTML tokenizing and JSON round trips of the fixtures) just
+before its case and records the case's fastest run relative to it ("x ref").
+The regression gate compares these relative times with
+fixtures/bench-baseline.json and fails when a case is slower than its
+baseline by more than --threshold, even at its best over --confirm
+re-measurements. A baseline without relative times (an older file) is not
+compared; run --save-baseline first.
+
+Usage:
+  python3 scripts/bench_parsers.py                    # compare against baseline
+  python3 scripts/bench_parsers.py --save-baseline    # record a new baseline
+  python3 scripts/bench_parsers.py --only github,papers --scales 1,10
+  python3 scripts/bench_parsers.py --backends html.parser,soup,strained,lxml
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional
+
+from parsing import BACKENDS
+from scraper_focus import TophubScraper
+from scraper_github import GitHubTrendingScraper
+from scraper_huggingface import HuggingFaceScraper
+from scraper_papers import HFPapersScraper
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PAGES_DIR = os.path.join(FIXTURE_DIR, 'pages')
+DEFAULT_BASELINE = os.path.join(FIXTURE_DIR, 'bench-baseline.json')
+REPEAT_RE = re.compile(r'<!--bench:repeat-->(.*?)<!--/bench:repeat-->', re.S)
+HREF_RE = re.compile(r'(href="[^"#]*)"')
+TOPHUB_TARGETS = ['第一财经', '雪球', '华尔街见闻', '集思录']
+# Fast cases are timed repeatedly until their runs add up to this many seconds
+MIN_TIMED_SECONDS = 0.25
+
+
+def load_page(name: str) -> str:
+    with open(os.path.join(PAGES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def scale_html(html: str, factor: int) -> str:
+    """Repeat the marked cards; copies get a #bench-N fragment on every href so they stay unique."""
+    def _repeat(m):
+        block = m.group(1)
+        return block + ''.join(HREF_RE.sub(rf'\1#bench-{n}"', block) for n in range(1, factor))
+    return REPEAT_RE.sub(_repeat, html)
+
+
+def scale_json(text: str, factor: int) -> str:
+    return json.dumps(json.loads(text) * factor)
+
+
+def count_sections(parsed: Dict[str, List[Dict[str, Any]]]) -> int:
+    return sum(len(sec['items']) for sections in parsed.values() for sec in sections)
+
+
+def build_cases(backend: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    github, papers, tophub = GitHubTrendingScraper(backend=backend), HFPapersScraper(backend=backend), TophubScraper(backend=backend)
+    models = HuggingFaceScraper()
+    return {
+        'github': {'page': 'github-trending.html', 'scale': scale_html,
+                   'parse': lambda html: len(github._parse_page(html, limit=None))},
+        'papers': {'page': 'hf-papers.html', 'scale': scale_html,
+                   'parse': lambda html: len(papers._parse_papers(html, limit=None))},
+        'tophub': {'page': 'tophub-finance.html', 'scale': scale_html,
+                   'parse': lambda html: count_sections(tophub._parse_category(html, TOPHUB_TARGETS))},
+        'eastmoney': {'page': 'eastmoney-yaowen.html', 'scale': scale_html, 'backend': False,
+                      'parse': lambda html: len(tophub._parse_eastmoney(html))},
+        'hf-models': {'page': 'hf-models.json', 'scale': scale_json, 'backend': False,
+                      'parse': lambda text: len(models._parse_models(text))},
+    }
+
+
+def max_rss() -> int:
+    """Peak resident set size of this process so far, in bytes."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def reference_seconds(repeat: int = 7) -> float:
+    """Fastest time of a fixed stdlib workload, the unit case timings are expressed in."""
+    html = load_page('github-trending.html') + load_page('hf-papers.html')
+    models = load_page('hf-models.json')
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        tokenizer = HTMLParser()
+        tokenizer.feed(html)
+        tokenizer.close()
+        for _ in range(20):
+            json.dumps(json.loads(models))
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def measure(parse: Callable[[str], int], page: str, repeat: int) -> Dict[str, float]:
+    """Time parse(page) at least repeat times and MIN_TIMED_SECONDS in total.
+
+    Call in a fresh process so peakRssBytes belongs to this case alone.
+    """
+    loaded = max_rss()
+    timings = []
+    items = 0
+    while len(timings) < repeat or sum(timings) < MIN_TIMED_SECONDS:
+        t0 = time.perf_counter()
+        items = parse(page)
+        timings.append(time.perf_counter() - t0)
+    peak = max_rss()
+    per_page = statistics.median(timings)
+    return {
+        'items': items,
+        'bytes': len(page.encode('utf-8')),
+        'secondsPerPage': per_page,
+        # The fastest run is the least disturbed by other load; the regression gate uses it
+        'bestSecondsPerPage': min(timings),
+        'itemsPerSecond': items / per_page if per_page else 0.0,
+        'peakRssBytes': peak,
+        'parseRssBytes': peak - loaded,
+        'runs': len(timings),
+    }
+
+
+def run_case(name: str, backend: Optional[str], factor: int, repeat: int) -> Dict[str, float]:
+    """Measure one case in a child process (see measure)."""
+    spec = json.dumps({'name': name, 'backend': backend, 'factor': factor, 'repeat': repeat})
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--case', spec],
+                         check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(out)
+
+
+def case_main(spec: str):
+    """Child side of run_case: print the measurement, with the reference timed just before it, as JSON."""
+    spec = json.loads(spec)
+    case = build_cases(spec['backend'])[spec['name']]
+    page = case['scale'](load_page(case['page']), spec['factor'])
+    reference = reference_seconds()
+    result = measure(case['parse'], page, spec['repeat'])
+    result['referenceSeconds'] = reference
+    result['relative'] = result['bestSecondsPerPage'] / reference
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper parsers against saved page fixtures")
+    parser.add_argument('--only', default='', help="Comma-separated case names (default: all)")
+    parser.add_argument('--scales', default='1,10,100', help="Comma-separated scale factors (default: 1,10,100)")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs at scale 1; larger scales use fewer")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument('--confirm', type=int, default=2, help="Re-measurements of a case before it counts as a regression")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline results file")
+    parser.add_argument('--save-baseline', action='store_true', help="Write results to the baseline file")
+    parser.add_argument('--json', help="Also write results to this file")
+    parser.add_argument('--backends', default='',
+                        help=f"Comma-separated parser backends to compare ({', '.join(BACKENDS)}); "
+                             "default: each scraper's own backend")
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.case:
+        case_main(args.case)
+        return
+
+    backends: List[Optional[str]] = [b for b in args.backends.split(',') if b] or [None]
+    names = [n for n in args.only.split(',') if n] or list(build_cases())
+    scales = [int(s) for s in args.scales.split(',') if s]
+    results: Dict[str, Dict[str, float]] = {}
+    # key -> run_case arguments, to re-measure a case that looks like a regression
+    jobs: Dict[str, tuple] = {}
+    print(f"{'case':<28}{'items':>8}{'KB':>9}{'ms/page':>11}{'x ref':>8}{'items/s':>12}{'RSS MB':>9}{'+MB':>8}")
+    for backend in backends:
+        cases = build_cases(backend)
+        for name in names:
+            case = cases[name]
+            if backend and not case.get('backend', True):
+                continue
+            for factor in scales:
+                key = f"{name}[{backend}]@{factor}x" if backend else f"{name}@{factor}x"
+                jobs[key] = (name, backend, factor, max(1, args.repeat // factor))
+                res = results[key] = run_case(*jobs[key])
+                print(f"{key:<28}{res['items']:>8}{res['bytes'] / 1024:>9.0f}{res['secondsPerPage'] * 1000:>11.2f}"
+                      f"{res['relative']:>8.2f}{res['itemsPerSecond']:>12.0f}{res['peakRssBytes'] / 1024 / 1024:>9.1f}"
+                      f"{res['parseRssBytes'] / 1024 / 1024:>8.1f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --save-baseline first.")
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = []
+    unnormalised = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if 'relative' not in base:
+            unnormalised.append(key)
+            continue
+        ratio = res['relative'] / base['relative']
+        # A slow result may just be a burst of other load: it only counts if it holds up when measured again
+        for _ in range(args.confirm):
+            if ratio <= 1 + args.threshold:
+                break
+            res = min(res, run_case(*jobs[key]), key=lambda r: r['relative'])
+            ratio = res['relative'] / base['relative']
+        if ratio > 1 + args.threshold:
+            regressions.append(f"{key}: {ratio:.2f}x baseline ({res['relative']:.2f} vs {base['relative']:.2f} x reference)")
+    if unnormalised:
+        print(f"Not compared ({len(unnormalised)} cases): the baseline has no relative times; run with --save-baseline.")
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%}.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Fast-path charset resolution for downloaded pages.
+
+Replaces requests' apparent_encoding, which runs statistical detection over
+the whole body. The declared charset is trusted first, in the order browsers
+use it:
+  bom      byte order mark at the start of the body
+  header   charset= in the Content-Type header
+  meta     <meta charset> / http-equiv in the first META_PREFIX bytes
+A declaration is only used when it decodes the start of the body; when the
+header and <meta> disagree, or nothing usable is declared, the charset last
+resolved for the same host is tried, and only then is the detector run on the
+first DETECT_PREFIX bytes. Every resolution is counted by the path taken.
+"""
+
+import codecs
+import re
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from requests.compat import chardet
+
+from parsing import header_charset
+
+META_PREFIX = 4096
+DETECT_PREFIX = 32 * 1024
+DEFAULT_CHARSET = 'utf-8'
+PATHS = ('bom', 'header', 'meta', 'host', 'detected', 'default')
+
+_BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+_META_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+# Labels decoded with a superset codec: the WHATWG Encoding Standard mappings, plus
+# ascii (what detectors report for an ASCII-only prefix) as utf-8
+_SUPERSETS = {'gb2312': 'gbk', 'gb_2312-80': 'gbk', 'x-gbk': 'gbk', 'latin-1': 'cp1252', 'iso8859-1': 'cp1252',
+              'ascii': 'utf-8'}
+
+
+def normalize(label: Optional[str]) -> Optional[str]:
+    """Canonical Python codec name for a charset label, or None when it is unknown."""
+    if not label:
+        return None
+    try:
+        name = codecs.lookup(label.strip().lower()).name
+    except LookupError:
+        return None
+    return _SUPERSETS.get(name, name)
+
+
+def meta_charset(body: bytes) -> Optional[str]:
+    match = _META_RE.search(body[:META_PREFIX])
+    return match.group(1).decode('ascii', 'ignore') if match else None
+
+
+def decodes(prefix: bytes, charset: str) -> bool:
+    """Whether prefix is valid in charset; a character cut off at the end of the prefix is allowed."""
+    try:
+        codecs.getincrementaldecoder(charset)().decode(prefix, final=False)
+    except (UnicodeDecodeError, LookupError):
+        return False
+    return True
+
+
+class CharsetResolver:
+    def __init__(self, detect_prefix: int = DETECT_PREFIX):
+        self.detect_prefix = detect_prefix
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, str] = {}
+        self.counts: Dict[str, int] = dict.fromkeys(PATHS, 0)
+
+    def _resolve(self, host: str, headers, body: bytes):
+        for bom, charset in _BOMS:
+            if body.startswith(bom):
+                return charset, 'bom'
+        prefix = body[:self.detect_prefix]
+        declared = {path: normalize(label) for path, label in
+                    (('header', header_charset(headers)), ('meta', meta_charset(body)))}
+        found = {path: charset for path, charset in declared.items() if charset}
+        if len(set(found.values())) == 1:
+            path, charset = next(iter(found.items()))
+            if decodes(prefix, charset):
+                return charset, path
+        with self._lock:
+            remembered = self._hosts.get(host)
+        if remembered and decodes(prefix, remembered):
+            return remembered, 'host'
+        detected = normalize((chardet.detect(prefix) or {}).get('encoding')) if chardet and prefix else None
+        if detected:
+            return detected, 'detected'
+        return DEFAULT_CHARSET, 'default'
+
+    def resolve(self, url: str, headers, body: bytes) -> str:
+        """Charset to decode body with; the result is remembered for url's host."""
+        host = urlsplit(url).hostname or ''
+        charset, path = self._resolve(host, headers, body)
+        with self._lock:
+            self.counts[path] += 1
+            if path != 'default':
+                self._hosts[host] = charset
+        return charset
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Versioned delta files for the JSON feeds.
+
+Every time BaseScraper.write_output replaces feeds/<name>.json, DeltaPublisher
+also records what changed since the previous run under
+feeds/deltas/<name>/:
+
+  manifest.json  {"feed", "version", "base", "deltas": [{"version", "bytes"}],
+                  "checksum", "idKeys", "lastUpdated", "artifacts"}
+  <version>.json {"feed", "version", "from", "ops": [...]} turning version - 1
+                 into version
+
+A client that holds version N with base <= N < version fetches the deltas
+N + 1 .. version and applies them in order (script.js loadFeed); any other
+client downloads the full feed, which is still written on every run, so a
+full download is only needed on the first visit and after falling behind the
+chain. The oldest deltas are dropped (and base moves up) while there are more
+than max_chain of them or they add up to the size of the feed; the chain
+starts over (base = version) whenever the previous feed file is not the one
+the manifest describes, e.g. because it was edited by hand.
+
+Lists of objects that all carry one of ID_KEYS are diffed by that stable id
+("url" for repositories, models, papers and headlines, "section" for Tophub
+sections; a repeated id gets a "#2", "#3", ... suffix in list order). Ops:
+
+  {"op": "set", "path": [...], "value": v}     replace or add a value
+  {"op": "remove", "path": [...]}              drop an object key
+  {"op": "list", "path": [...], "key": k,      drop the removed ids, put moved
+   "removed": [id], "moved": [[id, index]],     and added items at their new
+   "added": [[index, item]]}                   index and fill the free slots
+                                               with the rest in their old order
+
+"artifacts" describes the compact variants written next to the feed when
+they are enabled (artifacts.py), so a client learns which to download from
+the manifest it fetches anyway.
+
+A path is a list of object keys and, inside id-keyed lists, item ids. A list
+op comes before the ops addressing items inside that list.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+ID_KEYS = ('url', 'section')
+DEFAULT_MAX_CHAIN = 28
+DELTA_DIR = 'deltas'
+
+
+def list_key(items: Any) -> Optional[str]:
+    """The id key shared by every item of a non-empty list of objects, if any."""
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        return None
+    for key in ID_KEYS:
+        if all(isinstance(item.get(key), str) for item in items):
+            return key
+    return None
+
+
+def item_ids(items: List[Dict[str, Any]], key: str) -> List[str]:
+    seen: Dict[str, int] = {}
+    ids = []
+    for item in items:
+        value = item[key]
+        seen[value] = seen.get(value, 0) + 1
+        ids.append(value if seen[value] == 1 else f"{value}#{seen[value]}")
+    return ids
+
+
+def diff(old: Any, new: Any, path: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    """Ops turning old into new."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{'op': 'remove', 'path': [*path, k]} for k in old if k not in new]
+        for k, value in new.items():
+            if k in old:
+                ops += diff(old[k], value, (*path, k))
+            else:
+                ops.append({'op': 'set', 'path': [*path, k], 'value': value})
+        return ops
+    key = list_key(old)
+    if key and key == list_key(new):
+        return _diff_list(old, new, key, path)
+    return [] if old == new else [{'op': 'set', 'path': list(path), 'value': new}]
+
+
+def _in_order(positions: List[int]) -> set:
+    """Indexes into positions of a longest increasing run (not necessarily contiguous) of its values."""
+    tails: List[int] = []
+    tail_values: List[int] = []
+    links: List[int] = []
+    for i, value in enumerate(positions):
+        n = bisect_left(tail_values, value)
+        links.append(tails[n - 1] if n else -1)
+        if n == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[n] = i
+            tail_values[n] = value
+    keep = set()
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        keep.add(i)
+        i = links[i]
+    return keep
+
+
+def _diff_list(old: List[Dict[str, Any]], new: List[Dict[str, Any]], key: str, path: Sequence[str]) -> List[Dict[str, Any]]:
+    old_ids, new_ids = item_ids(old, key), item_ids(new, key)
+    old_index = {item_id: i for i, item_id in enumerate(old_ids)}
+    new_set = set(new_ids)
+    removed = [item_id for item_id in old_ids if item_id not in new_set]
+    common = [(i, item_id) for i, item_id in enumerate(new_ids) if item_id in old_index]
+    # Items that kept their order relative to each other only shift; just the others count as re-ranked
+    in_order = _in_order([old_index[item_id] for _, item_id in common])
+    moved = [[item_id, i] for n, (i, item_id) in enumerate(common) if n not in in_order]
+    added, nested = [], []
+    for i, (item_id, item) in enumerate(zip(new_ids, new)):
+        if item_id not in old_index:
+            added.append([i, item])
+        else:
+            nested += diff(old[old_index[item_id]], item, (*path, item_id))
+    ops = []
+    if removed or added or moved:
+        ops.append({'op': 'list', 'path': list(path), 'key': key, 'removed': removed, 'moved': moved, 'added': added})
+    return ops + nested
+
+
+def _child(container: Any, segment: str) -> Any:
+    if isinstance(container, list):
+        return container[item_ids(container, list_key(container)).index(segment)]
+    return container[segment]
+
+
+def apply(data: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply ops to data in place where possible; returns the patched document."""
+    for op in ops:
+        path = op['path']
+        if op['op'] == 'set' and not path:
+            data = op['value']
+            continue
+        parent = data
+        for segment in path[:-1]:
+            parent = _child(parent, segment)
+        target = path[-1] if path else None
+        if op['op'] == 'set':
+            if isinstance(parent, list):
+                parent[item_ids(parent, list_key(parent)).index(target)] = op['value']
+            else:
+                parent[target] = op['value']
+        elif op['op'] == 'remove':
+            del parent[target]
+        elif op['op'] == 'list':
+            items = _child(parent, target) if path else parent
+            removed, moved = set(op['removed']), dict(op['moved'])
+            result: List[Any] = [None] * (len(items) - len(removed) + len(op['added']))
+            rest = []
+            for item_id, item in zip(item_ids(items, op['key']), items):
+                if item_id in moved:
+                    result[moved[item_id]] = item
+                elif item_id not in removed:
+                    rest.append(item)
+            for i, item in op['added']:
+                result[i] = item
+            # The remaining items fill the free slots in their old order
+            rest.reverse()
+            items[:] = [rest.pop() if slot is None else slot for slot in result]
+        else:
+            raise ValueError(f"Unknown delta op {op['op']!r}")
+    return data
+
+
+def checksum(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _write_atomic(path: str, data: Any):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+class DeltaPublisher:
+    def __init__(self, max_chain: int = DEFAULT_MAX_CHAIN):
+        self.max_chain = max(0, max_chain)
+        self._lock = threading.Lock()
+        # feed file name -> (version, delta bytes or None when the chain starts over)
+        self.published: Dict[str, Tuple[int, Optional[int]]] = {}
+
+    @staticmethod
+    def directory(path: str) -> str:
+        """feeds/deltas/<name>/ for the feed file at path."""
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(os.path.dirname(path), DELTA_DIR, name)
+
+    @staticmethod
+    def _load_manifest(directory: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return manifest if isinstance(manifest, dict) and isinstance(manifest.get('version'), int) else None
+        except (OSError, ValueError):
+            return None
+
+    def publish(self, path: str, previous: Optional[str], text: str,
+                artifacts: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """Record the change from previous (the feed file's old text, None if there was none) to text.
+
+        Call once text has replaced the feed file at path; artifacts is what ArtifactWriter.publish returned
+        for it, if anything. Returns the size of the delta written, or None when the chain had to start over
+        from this version.
+        """
+        directory = self.directory(path)
+        os.makedirs(directory, exist_ok=True)
+        manifest = self._load_manifest(directory)
+        version = manifest['version'] + 1 if manifest else 1
+        deltas = list(manifest.get('deltas', [])) if manifest else []
+        size = None
+        if manifest and previous is not None and manifest.get('checksum') == checksum(previous):
+            data = json.loads(text)
+            ops = diff(json.loads(previous), data)
+            # Never publish a delta that does not reproduce the feed
+            if apply(json.loads(previous), ops) == data:
+                delta = {'feed': os.path.basename(path), 'version': version, 'from': version - 1, 'ops': ops}
+                size = len(json.dumps(delta, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        if size is None:
+            deltas = []
+        else:
+            deltas.append({'version': version, 'bytes': size})
+            # Past max_chain deltas, or once they add up to the feed's size, a full download is the cheaper catch-up
+            full = len(text.encode('utf-8'))
+            while deltas and (len(deltas) > self.max_chain or sum(d['bytes'] for d in deltas) >= full):
+                deltas.pop(0)
+            if deltas:
+                _write_atomic(os.path.join(directory, f"{version}.json"), delta)
+            else:
+                size = None
+        _write_atomic(os.path.join(directory, 'manifest.json'), {
+            'feed': os.path.basename(path), 'version': version, 'base': deltas[0]['version'] - 1 if deltas else version,
+            'deltas': deltas, 'checksum': checksum(text), 'idKeys': list(ID_KEYS),
+            'lastUpdated': datetime.now().isoformat(), **({'artifacts': artifacts} if artifacts else {}),
+        })
+        # Deltas that fell out of the chain are deleted only once the manifest no longer lists them
+        keep = {f"{d['version']}.json" for d in deltas} | {'manifest.json'}
+        for name in os.listdir(directory):
+            if name.endswith('.json') and name not in keep:
+                os.remove(os.path.join(directory, name))
+        with self._lock:
+            self.published[os.path.basename(path)] = (version, size)
+        return size
@@ -2,284 +2,225 @@
 """
 Asstar Data Fetcher - Unified CLI
 Consolidates all scrapers into a single entry point.
+
+Scrapers are looked up in registry.py and imported only when selected; the
+HTTP stack and parsers load after the command line has been parsed.
 """
 
 import os
-import sys
-import json
-import time
 import argparse
-import re
-from datetime import datetime, date
-from typing import Dict, List, Any, Optional
-from urllib.parse import urlencode
-
-import requests
-from bs4 import BeautifulSoup
-
-# --- Common Utilities ---
-
-class BaseScraper:
-    def __init__(self, user_agent: Optional[str] = None):
-        self.session = requests.Session()
-        ua = user_agent or 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36'
-        self.session.headers.update({'User-Agent': ua})
-        self.timeout = 30
-        self.max_retries = 3
-
-    def get(self, url: str) -> str:
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                resp = self.session.get(url, timeout=self.timeout)
-                resp.raise_for_status()
-                # Ensure correct encoding for Tophub and others
-                resp.encoding = resp.apparent_encoding or 'utf-8'
-                return resp.text
-            except Exception as e:
-                if attempt == self.max_retries:
-                    raise
-                print(f"  Attempt {attempt} failed for {url}: {e}. Retrying...")
-                time.sleep(attempt * 2)
-        return ""
-
-def get_output_path(filename: str) -> str:
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    feeds_dir = os.path.join(os.path.dirname(script_dir), 'feeds')
-    os.makedirs(feeds_dir, exist_ok=True)
-    return os.path.join(feeds_dir, filename)
-
-# --- GitHub Trending Scraper ---
-
-class GitHubTrendingScraper(BaseScraper):
-    def _parse_repo_article(self, article) -> Optional[Dict[str, Any]]:
-        try:
-            repo_link = article.find('h2', class_='h3').find('a')
-            repo_name = repo_link.get_text(strip=True)
-            repo_url = 'https://github.com' + repo_link.get('href')
-            description_elem = article.find('p')
-            description = description_elem.get_text(strip=True) if description_elem else 'No description available'
-            language_elem = article.find(attrs={'itemprop': 'programmingLanguage'})
-            language = language_elem.get_text(strip=True) if language_elem else 'Unknown'
-            stars_elem = article.find('a', href=re.compile(r'/stargazers'))
-            stars_text = stars_elem.get_text(strip=True) if stars_elem else '0'
-            stars = re.sub(r'[^\d]', '', stars_text) or '0'
-            forks_elem = article.find('a', href=re.compile(r'/forks'))
-            forks_text = forks_elem.get_text(strip=True) if forks_elem else '0'
-            forks = re.sub(r'[^\d]', '', forks_text) or '0'
-            stars_today_elem = article.find('span', class_='d-inline-block float-sm-right')
-            stars_today_text = stars_today_elem.get_text(strip=True) if stars_today_elem else '0'
-            stars_today = re.sub(r'[^\d]', '', stars_today_text) or '0'
-            built_by = []
-            avatar_imgs = article.find_all('img', class_='avatar')
-            for img in avatar_imgs[:5]:
-                username = img.get('alt', '').replace('@', '')
-                if username: built_by.append(f"@{username}")
-            
-            return {
-                'name': repo_name, 'description': description, 'language': language,
-                'stars': f"{int(stars):,}", 'forks': f"{int(forks):,}",
-                'starsToday': f"{int(stars_today):,}", 'url': repo_url, 'builtBy': built_by
-            }
-        except Exception as e:
-            print(f"  Error parsing GitHub repo: {e}")
-            return None
-
-    def run(self):
-        periods = ['daily', 'weekly', 'monthly']
-        all_data = {}
-        for period in periods:
-            print(f"Fetching GitHub Trending ({period})...")
-            url = f'https://github.com/trending?since={period}' if period != 'daily' else 'https://github.com/trending'
-            html = self.get(url)
-            soup = BeautifulSoup(html, 'html.parser')
-            repos = []
-            for article in soup.find_all('article', class_='Box-row')[:25]:
-                data = self._parse_repo_article(article)
-                if data: repos.append(data)
-            all_data[period] = repos
-            time.sleep(2)
-
-        output = {**all_data, 'lastUpdated': datetime.now().isoformat(), 'totalRepositories': sum(len(r) for r in all_data.values())}
-        with open(get_output_path('trending-data.json'), 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
-        print(f"Saved GitHub Trending data. Total: {output['totalRepositories']}")
-
-# --- HuggingFace Models Scraper ---
-
-class HuggingFaceScraper(BaseScraper):
-    def run(self):
-        api_base = 'https://huggingface.co/api/models'
-        categories = ['trending', 'likes', 'downloads']
-        all_data = {}
-        for cat in categories:
-            print(f"Fetching HuggingFace Models ({cat})...")
-            url = f"{api_base}?{urlencode({'sort': cat, 'limit': 25})}"
-            if cat == 'trending':
-                url = f"{api_base}?{urlencode({'trending': 'true', 'limit': 25})}"
-            
-            resp = self.session.get(url, timeout=self.timeout)
-            items = resp.json() if resp.status_code == 200 else []
-            
-            parsed_models = []
-            for item in items[:25]:
-                model_id = item.get('modelId') or item.get('id') or ''
-                if not model_id: continue
-                parsed_models.append({
-                    'name': model_id,
-                    'description': item.get('description') or item.get('cardData', {}).get('description') or 'No description available',
-                    'task': item.get('pipeline_tag') or 'Unknown',
-                    'parameters': item.get('cardData', {}).get('parameters') or 'Unknown',
-                    'likes': f"{int(item.get('likes') or 0):,}",
-                    'downloads': f"{int(item.get('downloads') or 0):,}",
-                    'url': f"https://huggingface.co/{model_id}",
-                    'tags': (item.get('tags') or item.get('cardData', {}).get('tags') or [])[:5]
-                })
-            all_data[cat] = parsed_models
-            time.sleep(2)
-
-        output = {**all_data, 'lastUpdated': datetime.now().isoformat(), 'totalModels': sum(len(m) for m in all_data.values())}
-        dest = get_output_path('huggingface-data.json')
-        if output['totalModels'] > 0 or not os.path.exists(dest):
-            with open(dest, 'w', encoding='utf-8') as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
-        print(f"Saved HuggingFace Models data. Total: {output['totalModels']}")
-
-# --- HuggingFace Papers Scraper ---
-
-class HFPapersScraper(BaseScraper):
-    def _parse_papers(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'lxml')
-        items = []
-        for article in soup.select('article, div[data-testid="paper-card"], li'):
-            a = article.select_one('a[href^="/papers/"]')
-            if not a: continue
-            href = a.get('href', '')
-            url = f"https://huggingface.co{href}" if href.startswith('/') else href
-            title_node = article.find(['h2', 'h3']) or a.find(['h2', 'h3'])
-            title = (title_node.get_text(strip=True) if title_node else None) or a.get('title') or a.get_text(strip=True)
-            if not title: continue
-            card_text = article.get_text(separator=' ', strip=True)
-            abstract = re.sub(re.escape(title), '', card_text).strip()[:240] if card_text else 'No abstract available.'
-            items.append({'title': title, 'authors': 'Unknown', 'abstract': abstract, 'url': url})
-        
-        if not items: # Fallback
-            for a in soup.select('a[href^="/papers/"]'):
-                href = a.get('href', ''); url = f"https://huggingface.co{href}" if href.startswith('/') else href
-                title = a.get('title') or a.get_text(strip=True)
-                if title: items.append({'title': title, 'authors': 'Unknown', 'abstract': 'No abstract available.', 'url': url})
-        
-        dedup = {f"{it['title']}|{it['url']}": it for it in items}
-        return list(dedup.values())[:50]
-
-    def run(self):
-        today = date.today()
-        year, week_num, _ = today.isocalendar()
-        print(f"Fetching HuggingFace Papers...")
-        payload = {}
-        targets = {
-            'daily': f"https://huggingface.co/papers/date/{today.strftime('%Y-%m-%d')}",
-            'weekly': f"https://huggingface.co/papers/week/{year}-W{week_num:02d}",
-            'monthly': f"https://huggingface.co/papers/month/{today.year}-{today.month:02d}",
-            'trending': "https://huggingface.co/papers/trending"
-        }
-        for key, url in targets.items():
-            try:
-                payload[key] = self._parse_papers(self.get(url))
-                time.sleep(2)
-            except Exception as e:
-                print(f"  Failed {key}: {e}"); payload[key] = []
-        
-        payload['lastUpdated'] = datetime.now().isoformat()
-        payload['totals'] = {k: len(v) for k, v in payload.items() if isinstance(v, list)}
-        dest = get_output_path('huggingface-papers-data.json')
-        if sum(payload['totals'].values()) > 0 or not os.path.exists(dest):
-            with open(dest, 'w', encoding='utf-8') as f:
-                json.dump(payload, f, indent=2, ensure_ascii=False)
-        print(f"Saved HuggingFace Papers data. Total: {sum(payload['totals'].values())}")
-
-# --- Tophub Focus Scraper ---
-
-class TophubScraper(BaseScraper):
-    def run(self):
-        specs = {
-            'finance': {'url': 'https://tophub.today/c/finance', 'targets': ['第一财经', '雪球', '华尔街见闻', '集思录']},
-            'tech': {'url': 'https://tophub.today/c/tech', 'targets': ['36氪', '少数派', 'IT之家']},
-            'developer': {'url': 'https://tophub.today/c/developer', 'targets': ['CSDN', '人人都是产品经理', '掘金']}
-        }
-        output = {'savedAt': datetime.now().isoformat(), 'categories': {}}
-        for cat, spec in specs.items():
-            print(f"Fetching Tophub ({cat})...")
-            html = self.get(spec['url'])
-            soup = BeautifulSoup(html, 'lxml')
-            cards = soup.select('.cc-cd')
-            parsed = {t: [] for t in spec['targets']}
-            for card in cards:
-                label = card.select_one('.cc-cd-lb').get_text(strip=True) if card.select_one('.cc-cd-lb') else ''
-                target = next((t for t in spec['targets'] if t in label), None)
-                if not target: continue
-                s_title = card.select_one('.cc-cd-sb-st').get_text(strip=True) if card.select_one('.cc-cd-sb-st') else ''
-                items = []
-                for a in card.select('.cc-cd-cb a[href]'):
-                    href = a.get('href', '').strip()
-                    if not (href.startswith('http')): continue
-                    row = a.select_one('.cc-cd-cb-ll')
-                    if not row: continue
-                    items.append({
-                        'rank': row.select_one('.s').get_text(strip=True) if row.select_one('.s') else '',
-                        'title': row.select_one('.t').get_text(strip=True) if row.select_one('.t') else '',
-                        'extra': row.select_one('.e').get_text(strip=True) if row.select_one('.e') else '',
-                        'url': href
-                    })
-                parsed[target].append({'section': s_title, 'items': items})
-            output['categories'][cat] = {'sourceUrl': spec['url'], 'sections': parsed}
-            time.sleep(2)
-
-        # EastMoney Integration
-        try:
-            print("Fetching EastMoney...")
-            em_html = self.get('https://finance.eastmoney.com/yaowen.html')
-            em_soup = BeautifulSoup(em_html, 'lxml')
-            em_items = []
-            seen = set()
-            for a in em_soup.select('a[href*="/a/"]')[:30]:
-                href = a.get('href', '').strip()
-                title = a.get_text(strip=True)
-                if not title or len(title) < 6 or '查看' in title: continue
-                if href.startswith('/'): href = 'https://finance.eastmoney.com' + href
-                if title not in seen:
-                    seen.add(title)
-                    em_items.append({'rank': '', 'title': title, 'extra': '', 'url': href})
-            output['categories'].setdefault('finance', {}) \
-                  .setdefault('sections', {})['东方财富网'] = [{'section': '焦点要闻', 'items': em_items}]
-        except Exception as e:
-            print(f"  Warning: EastMoney failed: {e}")
-
-        with open(get_output_path('realtime-focus.json'), 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
-        print("Saved Tophub Focus data.")
+import sqlite3
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import registry
+from analytics import DEFAULT_RISING_LIMIT, numpy_available
+from artifacts import DEFAULT_FORMATS as DEFAULT_ARTIFACT_FORMATS, FORMATS as ARTIFACT_FORMATS, MODULES as ARTIFACT_MODULES
+from artifacts import ArtifactWriter, available as artifact_available, smallest
+from delta import DEFAULT_MAX_CHAIN, DeltaPublisher
+from httpcache import DEFAULT_CACHE_DIR, ResponseCache
+from metrics import DEFAULT_METRICS_DIR, RunMetrics
+from parsing import BACKENDS as PARSER_BACKENDS
+from profiling import DEFAULT_PROFILE_DIR, DEFAULT_TOP as DEFAULT_PROFILE_TOP, Profiler
+from ratelimit import DEFAULT_MAX_PER_HOST, HostLimiter, RateLimiter, parse_rate_spec
+from snapshots import DEFAULT_SNAPSHOT_PATH, SnapshotStore
+from tophub import DEFAULT_CONFIG as DEFAULT_TOPHUB_CONFIG
 
 # --- CLI Entry Point ---
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    """Run fetch_all.py with argv (default: the command line); the standalone fetch_*.py scripts call this too."""
     parser = argparse.ArgumentParser(description="Asstar Data Fetcher")
-    parser.add_argument('target', choices=['github', 'huggingface', 'papers', 'focus', 'all'], help="Target data to fetch")
-    args = parser.parse_args()
-
-    scrapers = {
-        'github': GitHubTrendingScraper(),
-        'huggingface': HuggingFaceScraper(),
-        'papers': HFPapersScraper(),
-        'focus': TophubScraper()
-    }
-
-    if args.target == 'all':
-        for name, scraper in scrapers.items():
-            try:
-                scraper.run()
-            except Exception as e:
-                print(f"Critical error in {name}: {e}")
-    else:
-        scrapers[args.target].run()
+    available = registry.scrapers()
+    parser.add_argument('target', choices=[*available, 'all'], help="Target data to fetch")
+    parser.add_argument('--max-per-host', type=int, default=DEFAULT_MAX_PER_HOST,
+                        help=f"Maximum concurrent requests per host (default: {DEFAULT_MAX_PER_HOST})")
+    parser.add_argument('--rate', action='append', default=[], metavar='HOST=RATE[:BURST]',
+                        help="Override the per-host token bucket, e.g. github.com=0.5:2 (repeatable)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Directory of the conditional-request cache")
+    parser.add_argument('--no-cache', action='store_true', help="Disable the conditional-request cache")
+    # transport.MODES, spelled out so that --help does not import requests
+    parser.add_argument('--transport', choices=('live', 'record', 'replay'), default='live',
+                        help="live: network; record: network + save fixtures; replay: serve fixtures offline")
+    parser.add_argument('--fixtures', help="Fixture directory for record/replay (default: scripts/fixtures/http)")
+    parser.add_argument('--parser', action='append', default=[], metavar='[SCRAPER=]BACKEND',
+                        help=f"HTML parser backend ({', '.join(PARSER_BACKENDS)}) for all scrapers or one, "
+                             "e.g. --parser soup or --parser github=html.parser (repeatable)")
+    parser.add_argument('--http2', action='store_true',
+                        help="Multiplex requests over HTTP/2 (requires: pip install 'httpx[http2]')")
+    parser.add_argument('--no-warm', action='store_true', help="Do not open connections to every host before scraping")
+    parser.add_argument('--metrics-dir', default=DEFAULT_METRICS_DIR,
+                        help="Directory for the run report (JSON + Prometheus textfile) and run history")
+    parser.add_argument('--no-metrics', action='store_true', help="Do not write the run report")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile each scraper (cProfile + tracemalloc); runs scrapers one at a time and parses inline")
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR, help="Directory for the .prof files and memory snapshots")
+    parser.add_argument('--profile-top', type=int, default=DEFAULT_PROFILE_TOP,
+                        help=f"Hot functions listed per scraper (default: {DEFAULT_PROFILE_TOP})")
+    cpus = os.cpu_count() or 1
+    parser.add_argument('--gh-matrix', action='store_true',
+                        help="Also crawl GitHub Trending per programming language and spoken language")
+    parser.add_argument('--gh-languages', metavar='LIST',
+                        help="Comma-separated GitHub language slugs for --gh-matrix (default: 22 popular languages)")
+    parser.add_argument('--gh-spoken', metavar='LIST',
+                        help="Comma-separated spoken language codes for --gh-matrix, '' for none (default: zh,en,ja,ko,es,ru,de,fr)")
+    parser.add_argument('--gh-budget', type=float, metavar='SECONDS',
+                        help="Time budget of the --gh-matrix crawl; later pages are skipped (default: 900)")
+    parser.add_argument('--tophub-config', default=DEFAULT_TOPHUB_CONFIG,
+                        help="JSON file of Tophub categories and target boards (default: scripts/tophub.json)")
+    parser.add_argument('--hf-leaderboard', type=int, default=0, metavar='N',
+                        help="Also write HuggingFace leaderboards of the top N models per category and slice (default: off)")
+    parser.add_argument('--hf-slice', action='append', default=[], metavar='FILTER=VALUE',
+                        help="Leaderboard slice as an /api/models filter, e.g. pipeline_tag=text-generation or "
+                             "library=transformers; repeatable (default: a few popular tasks and libraries)")
+    parser.add_argument('--no-deltas', action='store_true', help="Do not publish delta files next to the feeds")
+    parser.add_argument('--delta-chain', type=int, default=DEFAULT_MAX_CHAIN, metavar='N',
+                        help=f"Deltas kept per feed before the chain is rebuilt from the full feed (default: {DEFAULT_MAX_CHAIN})")
+    parser.add_argument('--artifacts', default=','.join(DEFAULT_ARTIFACT_FORMATS), metavar='LIST',
+                        help=f"Comma-separated variants written next to every feed besides its .min.json "
+                             f"({', '.join(ARTIFACT_FORMATS)}; default: {','.join(DEFAULT_ARTIFACT_FORMATS)})")
+    parser.add_argument('--no-artifacts', action='store_true',
+                        help="Write only the pretty-printed feeds (and delete their compact variants)")
+    parser.add_argument('--snapshots', default=DEFAULT_SNAPSHOT_PATH, metavar='PATH',
+                        help="SQLite database the rank and count history is appended to (default: .cache/snapshots/snapshots.sqlite)")
+    parser.add_argument('--no-snapshots', action='store_true', help="Do not record snapshots of the feeds")
+    parser.add_argument('--rising', type=int, default=DEFAULT_RISING_LIMIT, metavar='N',
+                        help=f"Items per rising list computed from the snapshots, 0 for none (default: {DEFAULT_RISING_LIMIT})")
+    parser.add_argument('--parse-workers', type=int, default=cpus if cpus > 1 else 0,
+                        help="Processes used for HTML/JSON parsing; 0 parses inline (default: CPU count, inline on one core)")
+    args = parser.parse_args(argv)
+    backends: Dict[str, str] = {}
+    for spec in args.parser:
+        name, _, backend = spec.rpartition('=')
+        if backend not in PARSER_BACKENDS:
+            parser.error(f"unknown parser backend '{backend}' (choose from {', '.join(PARSER_BACKENDS)})")
+        backends[name or '*'] = backend
+    artifact_formats = [fmt for fmt in args.artifacts.split(',') if fmt]
+    for fmt in artifact_formats:
+        if fmt not in ARTIFACT_FORMATS:
+            parser.error(f"unknown artifact format '{fmt}' (choose from {', '.join(ARTIFACT_FORMATS)})")
+    names = list(available) if args.target == 'all' else [args.target]
+    classes = {}
+    for name in names:
+        try:
+            classes[name] = registry.load(available[name])
+        except (ImportError, AttributeError, TypeError) as e:
+            if args.target != 'all':
+                raise
+            print(f"Critical error in {name}: {e}")
+    try:
+        for cls in classes.values():
+            cls.configure(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # requests and the HTTP stack are only imported once there is something to fetch
+    from httpclient import HttpClient, http2_available
+    from scraper import BaseScraper, make_parse_pool
+    from transport import DEFAULT_FIXTURE_DIR, make_transport
+
+    BaseScraper.host_limiter = HostLimiter(args.max_per_host)
+    BaseScraper.rate_limiter = RateLimiter(dict(parse_rate_spec(spec) for spec in args.rate))
+    BaseScraper.transport = make_transport(args.transport, args.fixtures or DEFAULT_FIXTURE_DIR)
+    if args.http2 and not http2_available():
+        print("HTTP/2 requested but httpx[http2] is not installed; using HTTP/1.1")
+    BaseScraper.client = HttpClient(pool_maxsize=args.max_per_host, http2=args.http2)
+    # Recorded fixtures must hold full 200 bodies and replay must be deterministic, so bypass the cache
+    use_cache = not args.no_cache and args.transport == 'live'
+    BaseScraper.cache = ResponseCache(args.cache_dir) if use_cache else None
+    metrics = BaseScraper.metrics = RunMetrics()
+    profiler = BaseScraper.profiler = Profiler(args.profile_dir, args.profile_top) if args.profile else None
+    deltas = BaseScraper.deltas = DeltaPublisher(args.delta_chain) if not args.no_deltas else None
+    artifacts = None
+    if not args.no_artifacts:
+        for fmt in artifact_formats:
+            if not artifact_available(fmt):
+                print(f"{fmt} variants need the {ARTIFACT_MODULES[fmt]} module (pip install {ARTIFACT_MODULES[fmt]}); skipped")
+        artifacts = ArtifactWriter(artifact_formats)
+    BaseScraper.artifacts = artifacts
+    snapshots = None
+    if not args.no_snapshots:
+        try:
+            snapshots = SnapshotStore(args.snapshots)
+        except sqlite3.Error as e:
+            print(f"Snapshot store unavailable, not recording snapshots: {e}")
+    BaseScraper.snapshots = snapshots
+
+    scrapers = {name: cls(backend=backends.get(name, backends.get('*'))) for name, cls in classes.items()}
+    # Parsing in worker processes would hide it from the profiler
+    BaseScraper.parse_pool = make_parse_pool(0 if profiler else args.parse_workers)
+    if not args.no_warm and not BaseScraper.transport.offline:
+        BaseScraper.client.warm(origin for scraper in scrapers.values() for origin in scraper.origins)
+
+    try:
+        def _run_one(name):
+            with metrics.scraper(name), (profiler.run(name) if profiler else nullcontext()):
+                scrapers[name].run()
+
+        if args.target == 'all':
+            def _run(name):
+                try:
+                    _run_one(name)
+                except Exception as e:
+                    print(f"Critical error in {name}: {e}")
+            with ThreadPoolExecutor(max_workers=1 if profiler else len(scrapers)) as pool:
+                list(pool.map(_run, scrapers))
+        else:
+            _run_one(args.target)
+        if snapshots and args.rising > 0:
+            if numpy_available():
+                from scraper_rising import RisingFeeds
+                RisingFeeds.limit = args.rising
+                try:
+                    with metrics.scraper(RisingFeeds.name):
+                        RisingFeeds().run()
+                except Exception as e:
+                    print(f"Critical error in {RisingFeeds.name}: {e}")
+            else:
+                print("Rising lists need NumPy (pip install numpy); skipped")
+    finally:
+        if profiler:
+            for line in profiler.report():
+                print(line)
+        if not args.no_metrics:
+            for line in metrics.write(args.metrics_dir):
+                print(f"Metrics: {line}")
+            print(f"Run report written to {args.metrics_dir}")
+
+    if BaseScraper.parse_pool:
+        BaseScraper.parse_pool.shutdown()
+    if BaseScraper.cache:
+        cache = BaseScraper.cache
+        cache.evict()
+        print(f"HTTP cache: {cache.hits} revalidated (304), {cache.misses} downloaded")
+    if deltas and deltas.published:
+        print("Delta feeds: " + ', '.join(f"{name} v{version} " + (f"({size / 1024:.1f} KB)" if size is not None else "(new chain)")
+                                          for name, (version, size) in sorted(deltas.published.items())))
+    if artifacts and artifacts.written:
+        total = artifacts.summary()
+        print(f"Compact feeds: {len(artifacts.written)} feeds, {total['json'] / 1024:.1f} KB pretty -> "
+              + ', '.join(f"{fmt} {size / 1024:.1f} KB ({1 - size / total['json']:.0%} saved)"
+                          for fmt, size in total.items() if fmt != 'json'))
+        for name, sizes in sorted(artifacts.written.items()):
+            best = smallest(sizes)
+            print(f"  {name}: {sizes['json'] / 1024:.1f} KB -> {best} {sizes[best] / 1024:.1f} KB "
+                  f"(-{1 - sizes[best] / sizes['json']:.0%})")
+    if snapshots:
+        if snapshots.run_id is not None:
+            print(f"Snapshots: run #{snapshots.run_id}, {snapshots.recorded:,} values from "
+                  f"{len(snapshots.sources_recorded)} sources recorded in {snapshots.path}"
+                  + (" (new history: no earlier runs were found)" if snapshots.run_id == 1 else ''))
+        snapshots.close()
+    for breaker in BaseScraper.breakers.tripped():
+        print(f"Circuit breaker: {breaker.host} opened {breaker.opened} time(s), {breaker.failures} consecutive failures")
+    counts = BaseScraper.charsets.counts
+    if any(counts.values()):
+        print("Charset resolution: " + ', '.join(f"{path} {n}" for path, n in counts.items() if n))
+    for host, stats in sorted(BaseScraper.client.connection_stats().items()):
+        print(f"HTTP connections: {host} ({stats['protocol']}) {stats['requests']} requests over "
+              f"{stats['connections']} connections, {stats['reused']} reused")
+    BaseScraper.client.close()
 
 if __name__ == "__main__":
     main()
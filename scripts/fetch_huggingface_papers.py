@@ -2,194 +2,172 @@
 """
 HuggingFace Papers Fetcher
 
-抓取 Hugging Face Papers 页面：
-- Daily:   https://huggingface.co/papers/date/YYYY-MM-DD
-- Weekly:  https://huggingface.co/papers/week/YYYY-Www
-- Monthly: https://huggingface.co/papers/month/YYYY-MM
-- Trending:https://huggingface.co/papers/trending
+不带子命令时等同于 `python3 scripts/fetch_all.py papers`（scraper_papers.py）：抓取
+Daily / Weekly / Monthly / Trending 四个列表并保存到 feeds/huggingface-papers-data.json，
+其余命令行参数原样传给 fetch_all.py。
 
-将解析后的列表保存到项目根目录的 huggingface-papers-data.json
+历史回填（backfill 子命令）：并发抓取任意日期区间内每天的论文，按日期存档到
+feeds/papers-archive/YYYY/MM/YYYY-MM-DD.json。每完成一天即写入该天的存档文件，
+存档文件本身就是检查点：中断后重新运行会跳过已存档的日期，只抓取缺失或失败的日期。
+回填最晚到昨天（当天的列表还在增加），解析不出论文的日期不写存档，下次运行重新抓取。
+
+  python scripts/fetch_huggingface_papers.py backfill --start 2024-01-01 --end 2024-06-30
 """
 
-from __future__ import annotations
+import argparse
 import os
 import json
-import time
 import re
-from datetime import datetime, date
+import sys
+from datetime import datetime, date, timedelta
 from typing import Dict, List, Any
 
-import requests
-from bs4 import BeautifulSoup
+import fetch_all
+from httpclient import HttpClient
+from ratelimit import HostLimiter, RateLimiter, parse_rate_spec
+from records import SCHEMA_VERSION
+from scraper import BaseScraper
+from scraper_papers import HFPapersScraper
+from workqueue import WorkQueue
 
+FEEDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'feeds')
+DEFAULT_ARCHIVE_DIR = os.path.join(FEEDS_DIR, 'papers-archive')
+DEFAULT_BACKFILL_WORKERS = 4
 
-class HFPapersScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36'
-        })
-        self.timeout_seconds = 20
-        self.max_retries = 3
 
-    def _get(self, url: str) -> str:
-        last_error: Exception | None = None
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                resp = self.session.get(url, timeout=self.timeout_seconds)
-                resp.raise_for_status()
-                return resp.text
-            except Exception as e:
-                last_error = e
-                time.sleep(attempt * 2)
-        raise RuntimeError(f"GET failed for {url}: {last_error}")
-
-    def _parse_papers(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'lxml')
-        items: List[Dict[str, Any]] = []
-
-        # 优先从明显的卡片/文章结构中提取标题
-        # 1) 文章卡片中查找链接与标题
-        for article in soup.select('article, div[data-testid="paper-card"], li'):  # 尽量覆盖
-            a = article.select_one('a[href^="/papers/"]')
-            if not a:
-                continue
-            href = a.get('href', '')
-            url = f"https://huggingface.co{href}" if href.startswith('/') else href
-
-            # 标题优先取卡片内的 h2/h3/strong，退化为链接文本或 title 属性
-            title_node = article.find(['h2', 'h3']) or a.find(['h2', 'h3'])
-            title = (title_node.get_text(strip=True) if title_node else None) or a.get('title') or a.get_text(strip=True)
-            if not title:
-                continue
-
-            # 作者与摘要从卡片文本中提取（尽量保守）
-            authors = None
-            abstract = None
-            card_text = article.get_text(separator=' ', strip=True)
-            if card_text:
-                # 去掉标题本身，避免重复
-                cleaned = re.sub(re.escape(title), '', card_text).strip()
-                abstract = cleaned[:240] if cleaned else None
-
-            items.append({
-                'title': title,
-                'authors': authors or 'Unknown',
-                'abstract': abstract or 'No abstract available.',
-                'url': url,
-            })
-
-        # 2) 兜底：页面中所有 /papers/ 链接（防止结构变动）
-        if not items:
-            for a in soup.select('a[href^="/papers/"]'):
-                href = a.get('href', '')
-                url = f"https://huggingface.co{href}" if href.startswith('/') else href
-                title = a.get('title') or a.get_text(strip=True)
-                if not title:
-                    continue
-                items.append({
-                    'title': title,
-                    'authors': 'Unknown',
-                    'abstract': 'No abstract available.',
-                    'url': url,
-                })
-
-        # 去重（按标题+url）
-        dedup: Dict[str, Dict[str, Any]] = {}
-        for it in items:
-            key = f"{it['title']}|{it['url']}"
-            dedup[key] = it
-        return list(dedup.values())[:50]
+class PapersBackfill(HFPapersScraper):
+    """在 fetch_all.py papers 的抓取器上按日期存档：请求、重试、限速与卡片解析都与之共用"""
 
     def fetch_daily(self, dt: date) -> List[Dict[str, Any]]:
-        url = f"https://huggingface.co/papers/date/{dt.strftime('%Y-%m-%d')}"
-        html = self._get(url)
-        data = self._parse_papers(html)
-        for it in data:
-            it['date'] = dt.strftime('%Y-%m-%d')
-        return data
-
-    def fetch_weekly(self, year: int, week: int) -> List[Dict[str, Any]]:
-        url = f"https://huggingface.co/papers/week/{year}-W{week:02d}"
-        html = self._get(url)
-        data = self._parse_papers(html)
-        for it in data:
-            it['week'] = f"{year}-W{week:02d}"
-        return data
-
-    def fetch_monthly(self, year: int, month: int) -> List[Dict[str, Any]]:
-        url = f"https://huggingface.co/papers/month/{year}-{month:02d}"
-        html = self._get(url)
-        data = self._parse_papers(html)
-        for it in data:
-            it['month'] = f"{year}-{month:02d}"
-        return data
-
-    def fetch_trending(self) -> List[Dict[str, Any]]:
-        url = "https://huggingface.co/papers/trending"
-        html = self._get(url)
-        return self._parse_papers(html)
+        day = dt.strftime('%Y-%m-%d')
+        # 存档保留当天的全部论文，不截断为前 50 篇
+        papers = self.get_parsed(f"https://huggingface.co/papers/date/{day}", self._parse_papers, None)
+        if not papers:
+            # 存档即检查点：空结果（页面改版、临时错误页）不写存档，下次运行重新抓取
+            raise ValueError(f"no papers parsed for {day}")
+        return [{**paper, 'date': day} for paper in papers]
 
     @staticmethod
-    def iso_week_of(dt: date) -> tuple[int, int]:
-        # ISO week number
-        return dt.isocalendar().year, dt.isocalendar().week
-
-    def update_all(self) -> Dict[str, Any]:
-        today = date.today()
-        year, week = self.iso_week_of(today)
-        print(f"Fetching papers for date={today}, week={year}-W{week:02d}, month={today.year}-{today.month:02d}")
-
-        payload: Dict[str, Any] = {}
-
+    def archive_path(archive_dir: str, dt: date) -> str:
+        return os.path.join(archive_dir, dt.strftime('%Y'), dt.strftime('%m'), f"{dt.strftime('%Y-%m-%d')}.json")
+
+    def _write_day(self, archive_dir: str, dt: date, papers: List[Dict[str, Any]]):
+        # 先写临时文件再替换，中断时不会留下半个存档（否则会被当作已完成而跳过）
+        path = self.archive_path(archive_dir, dt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'schemaVersion': SCHEMA_VERSION, 'date': dt.strftime('%Y-%m-%d'), 'fetchedAt': datetime.now().isoformat(),
+                       'total': len(papers), 'papers': papers}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+    def _update_index(self, archive_dir: str, counts: Dict[str, int]):
+        """index.json 记录每个已存档日期的论文数；只读取索引中还没有的存档文件"""
+        index_path = os.path.join(archive_dir, 'index.json')
+        days: Dict[str, int] = {}
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    days = json.load(f).get('days', {})
+            except (OSError, ValueError):
+                days = {}
+        days.update(counts)
+        for root, _, files in os.walk(archive_dir):
+            for name in files:
+                day = name[:-len('.json')]
+                if name.endswith('.json') and re.fullmatch(r'\d{4}-\d{2}-\d{2}', day) and day not in days:
+                    try:
+                        with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                            days[day] = json.load(f).get('total', 0)
+                    except (OSError, ValueError):
+                        continue
+        days = dict(sorted(days.items()))
+        tmp = index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'lastUpdated': datetime.now().isoformat(), 'days': days,
+                       'totalPapers': sum(days.values())}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, index_path)
+
+    def backfill(self, start: date, end: date, archive_dir: str = DEFAULT_ARCHIVE_DIR,
+                 workers: int = DEFAULT_BACKFILL_WORKERS, force: bool = False) -> Dict[str, int]:
+        """并发抓取 [start, end] 内每一天的论文并逐日存档；已存档的日期直接跳过（force 时重新抓取）
+
+        end 最晚为昨天：当天的列表还在增加，存档后就不会再被重新抓取。
+        """
+        end = min(end, last_complete_day())
+        days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+        todo = [d for d in days if force or not os.path.exists(self.archive_path(archive_dir, d))]
+        print(f"Backfilling papers {start} .. {end}: {len(days)} days, "
+              f"{len(days) - len(todo)} already archived, {len(todo)} to fetch with {workers} workers")
+        counts: Dict[str, int] = {}
+        failed = 0
         try:
-            payload['daily'] = self.fetch_daily(today)
-            time.sleep(2)
-        except Exception as e:
-            print('Daily fetch failed:', e)
-            payload['daily'] = []
+            # 有界工作队列：最多 workers 个请求在途，结果按完成顺序返回，每完成一天立即写入检查点
+            for dt, papers, error in WorkQueue(self.fetch_daily, workers).run(todo):
+                if error is not None:
+                    failed += 1
+                    print(f"  {dt}: failed, will be retried on the next run: {error}")
+                    continue
+                self._write_day(archive_dir, dt, papers)
+                counts[dt.strftime('%Y-%m-%d')] = len(papers)
+                print(f"  {dt}: {len(papers)} papers ({len(counts) + failed}/{len(todo)})")
+        except KeyboardInterrupt:
+            print(f"Interrupted after {len(counts)} days; run the same command again to resume")
+            raise
+        finally:
+            if counts:
+                self._update_index(archive_dir, counts)
+        return {'days': len(days), 'skipped': len(days) - len(todo), 'fetched': len(counts), 'failed': failed}
 
-        try:
-            payload['weekly'] = self.fetch_weekly(year, week)
-            time.sleep(2)
-        except Exception as e:
-            print('Weekly fetch failed:', e)
-            payload['weekly'] = []
 
-        try:
-            payload['monthly'] = self.fetch_monthly(today.year, today.month)
-            time.sleep(2)
-        except Exception as e:
-            print('Monthly fetch failed:', e)
-            payload['monthly'] = []
+def last_complete_day() -> date:
+    return date.today() - timedelta(days=1)
 
-        try:
-            payload['trending'] = self.fetch_trending()
-        except Exception as e:
-            print('Trending fetch failed:', e)
-            payload['trending'] = []
 
-        payload['lastUpdated'] = datetime.now().isoformat()
-        payload['totals'] = {k: len(v) for k, v in payload.items() if isinstance(v, list)}
-        return payload
+def _parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)")
 
 
 def main():
-    scraper = HFPapersScraper()
-    data = scraper.update_all()
-    out_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'feeds', 'huggingface-papers-data.json')
-
-    # 如果全部为空，尽量保留旧文件
-    if sum(data['totals'].values()) == 0 and os.path.exists(out_path):
-        print('No papers fetched; preserve existing huggingface-papers-data.json')
+    if sys.argv[1:2] != ['backfill']:
+        fetch_all.main(['papers', *sys.argv[1:]])
         return
 
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    print(f'Saved papers to {out_path}')
+    parser = argparse.ArgumentParser(prog='fetch_huggingface_papers.py backfill',
+                                     description="Archive the daily papers of a date range, resuming where a previous run stopped")
+    parser.add_argument('--start', type=_parse_date, required=True, help="First day, YYYY-MM-DD")
+    parser.add_argument('--end', type=_parse_date, default=last_complete_day(),
+                        help="Last day, YYYY-MM-DD (default and latest: yesterday)")
+    parser.add_argument('--archive-dir', default=DEFAULT_ARCHIVE_DIR, help="Archive directory (default: feeds/papers-archive)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_BACKFILL_WORKERS,
+                        help=f"Days fetched concurrently (default: {DEFAULT_BACKFILL_WORKERS})")
+    parser.add_argument('--rate', metavar='RATE[:BURST]',
+                        help="Requests per second to huggingface.co shared by all workers (default: ratelimit.py)")
+    parser.add_argument('--force', action='store_true', help="Refetch days that are already archived")
+    args = parser.parse_args(sys.argv[2:])
+    if args.start > last_complete_day():
+        parser.error('--start must be yesterday or earlier; today\'s papers are still being added')
+    if args.end < args.start:
+        parser.error('--end is before --start')
+
+    workers = max(1, args.workers)
+    rates = dict([parse_rate_spec(f"huggingface.co={args.rate}")]) if args.rate else None
+    # 所有并发线程共用同一个按域名的令牌桶，回填时对 huggingface.co 的总请求速率不变
+    BaseScraper.rate_limiter = RateLimiter(rates)
+    BaseScraper.host_limiter = HostLimiter(workers)
+    BaseScraper.client = HttpClient(pool_maxsize=workers)
+    try:
+        result = PapersBackfill().backfill(args.start, args.end, args.archive_dir, workers, args.force)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    finally:
+        BaseScraper.client.close()
+    print(f"Backfill done: {result['fetched']} days fetched, {result['skipped']} already archived, "
+          f"{result['failed']} failed")
 
 
 if __name__ == '__main__':
     main()
-
-
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Hedged fetching over alternative candidate URLs.
+
+hedged() starts the candidates in priority order, each one `stagger` seconds
+after the previous, or immediately once every candidate started so far has
+failed. The result of the highest-priority candidate that returns something
+valid is used as soon as every candidate ranked above it has failed; the
+others are cancelled: queued ones never start, and running ones send no
+further request (fetch passes the cancel event on to call_with_retries,
+which also cuts a backoff wait short); a result they still return is dropped.
+
+The first candidate is the preferred source and always starts first. The
+order of the fallbacks behind it is learned: HedgeStats keeps the outcome of
+each candidate's last WINDOW runs on disk and ranks the fallbacks by their
+smoothed success rate, keeping the declared order between equally good ones.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from retry import Cancelled
+
+DEFAULT_STATS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'hedge-stats.json')
+DEFAULT_STAGGER = 0.5
+WINDOW = 20
+
+
+class HedgeCancelled(Cancelled):
+    """A better-ranked candidate already succeeded."""
+
+
+class HedgeStats:
+    def __init__(self, path: Optional[str] = DEFAULT_STATS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._outcomes: Dict[str, Dict[str, List[int]]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._outcomes = json.load(f)
+            except (OSError, ValueError):
+                self._outcomes = {}
+
+    def score(self, group: str, candidate: str) -> float:
+        """Success rate over the recent window, smoothed so untried candidates score 0.5."""
+        with self._lock:
+            recent = self._outcomes.get(group, {}).get(candidate, [])
+            return (sum(recent) + 1) / (len(recent) + 2)
+
+    def order(self, group: str, candidates: List[str]) -> List[str]:
+        """The first candidate stays first; the fallbacks are ranked by score."""
+        scores = {c: self.score(group, c) for c in candidates[1:]}
+        return candidates[:1] + sorted(candidates[1:], key=lambda c: -scores[c])
+
+    def record(self, group: str, candidate: str, success: bool):
+        with self._lock:
+            recent = self._outcomes.setdefault(group, {}).setdefault(candidate, [])
+            recent.append(int(success))
+            del recent[:-WINDOW]
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            data = json.dumps(self._outcomes, indent=2)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+
+def hedged(candidates: List[str], fetch: Callable[[str, threading.Event], Any], valid: Callable[[Any], bool],
+           stagger: float = DEFAULT_STAGGER, stats: Optional[HedgeStats] = None, group: str = '') -> Tuple[str, Any]:
+    """Return (candidate, result) of the best-ranked candidate whose fetch(candidate, cancel) result is valid.
+
+    fetch should make no further request once the cancel event is set (raising retry.Cancelled). Raises the last error when no candidate succeeds.
+    """
+    ranked = stats.order(group, candidates) if stats else list(candidates)
+    cancel = threading.Event()
+
+    def _run(candidate):
+        if cancel.is_set():
+            raise HedgeCancelled(candidate)
+        result = fetch(candidate, cancel)
+        if not valid(result):
+            raise ValueError(f"Invalid or empty result from {candidate}")
+        return result
+
+    pool = ThreadPoolExecutor(max_workers=len(ranked))
+    futures = []
+    next_start = time.monotonic()
+    try:
+        while True:
+            all_failed = all(f.done() and f.exception() for f in futures)
+            if len(futures) < len(ranked) and (all_failed or time.monotonic() >= next_start):
+                futures.append(pool.submit(_run, ranked[len(futures)]))
+                next_start = time.monotonic() + stagger
+                continue
+            # Walk in priority order: the first unfinished candidate blocks everything ranked below it
+            last_error: Optional[BaseException] = None
+            for candidate, future in zip(ranked, futures):
+                if not future.done():
+                    break
+                last_error = future.exception()
+                if last_error is None:
+                    return candidate, future.result()
+            else:
+                if len(futures) == len(ranked):
+                    raise last_error
+            pending = [f for f in futures if not f.done()]
+            timeout = max(0.0, next_start - time.monotonic()) if len(futures) < len(ranked) else None
+            wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+    finally:
+        cancel.set()
+        if stats:
+            for candidate, future in zip(ranked, futures):
+                if future.done() and not isinstance(future.exception(), Cancelled):
+                    stats.record(group, candidate, future.exception() is None)
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP conditional-request cache.
+
+Responses are stored on disk keyed by URL together with their ETag and
+Last-Modified validators. The next request for the same URL sends
+If-None-Match / If-Modified-Since; on a 304 the stored body is reused, and so
+is any parsed result that was saved alongside it, so unchanged pages skip
+both the download and the parse.
+
+Layout (one pair of files per URL, named by the SHA-1 of the URL):
+  <dir>/<sha1>.json   metadata, validators and parsed results
+  <dir>/<sha1>.body   decoded response text (UTF-8)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'http')
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+class ResponseCache:
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age: float = DEFAULT_MAX_AGE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.body'
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _load_meta(self, url: str) -> Optional[Dict[str, Any]]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or not os.path.exists(body_path):
+            return None
+        if time.time() - meta.get('validatedAt', 0) > self.max_age:
+            return None
+        return meta
+
+    def _save_meta(self, url: str, meta: Dict[str, Any]):
+        meta_path, _ = self._paths(url)
+        self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validators to send for url, empty when nothing usable is cached."""
+        meta = self._load_meta(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('lastModified'):
+            headers['If-Modified-Since'] = meta['lastModified']
+        return headers
+
+    def revalidated(self, url: str) -> Optional[str]:
+        """Handle a 304: refresh the entry's age and return the stored body."""
+        meta = self._load_meta(url)
+        if not meta:
+            return None
+        _, body_path = self._paths(url)
+        with open(body_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        meta['validatedAt'] = time.time()
+        self._save_meta(url, meta)
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def store(self, url: str, headers, text: str):
+        """Save a fresh 200 response. Parsed results of the previous body are dropped.
+
+        Without validators nothing can be revalidated, so any older entry for url is deleted instead.
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            self.misses += 1
+        meta_path, body_path = self._paths(url)
+        if not etag and not last_modified:
+            self._remove(meta_path, body_path)
+            return
+        body = text.encode('utf-8')
+        self._write_atomic(body_path, body)
+        now = time.time()
+        self._save_meta(url, {
+            'url': url, 'etag': etag, 'lastModified': last_modified,
+            'storedAt': now, 'validatedAt': now, 'size': len(body), 'parsed': {}
+        })
+
+    def parsed(self, url: str, key: str) -> Any:
+        meta = self._load_meta(url)
+        return (meta or {}).get('parsed', {}).get(key)
+
+    def store_parsed(self, url: str, key: str, value: Any):
+        meta = self._load_meta(url)
+        if not meta:
+            return
+        meta.setdefault('parsed', {})[key] = value
+        self._save_meta(url, meta)
+
+    def evict(self) -> int:
+        """Drop entries older than max_age, then the least recently validated ones until under max_bytes."""
+        entries = []
+        removed = 0
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            body_path = meta_path[:-len('.json')] + '.body'
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                size = os.path.getsize(meta_path) + os.path.getsize(body_path)
+            except (OSError, ValueError):
+                meta, size = {}, 0
+            validated = meta.get('validatedAt', 0)
+            if not meta or now - validated > self.max_age:
+                removed += self._remove(meta_path, body_path)
+            else:
+                entries.append((validated, size, meta_path, body_path))
+        total = sum(e[1] for e in entries)
+        for validated, size, meta_path, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            removed += self._remove(meta_path, body_path)
+            total -= size
+        return removed
+
+    @staticmethod
+    def _remove(*paths: str) -> int:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return 1
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Shared, pooled HTTP client used by every scraper.
+
+One requests.Session is shared by all scrapers, so TCP/TLS connections stay
+alive and are reused across pages and scrapers hitting the same host:
+- a tuned urllib3 connection pool per host (pool_maxsize follows --max-per-host)
+- an explicit Accept-Encoding: br when a brotli decoder is installed, then gzip
+- optional HTTP/2 through httpx (pip install 'httpx[http2]'), which multiplexes
+  all requests to a host over a single connection
+- warm() opens one connection per origin in parallel before scraping starts
+- connection_stats() reports requests vs. newly opened connections per host
+- take_connect_timing() returns the DNS / TCP connect / TLS handshake times of
+  the connection the calling thread's last request had to open
+"""
+
+import importlib.util
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36'
+DEFAULT_POOL_MAXSIZE = 2
+# Hosts whose pools are kept open; evicted pools lose their connections and stats
+DEFAULT_POOL_HOSTS = 16
+WARM_TIMEOUT = 5.0
+
+
+def _installed(*modules: str) -> bool:
+    return all(importlib.util.find_spec(m) is not None for m in modules)
+
+
+def accept_encoding() -> str:
+    """Only advertise brotli when urllib3 can decode it."""
+    if _installed('brotli') or _installed('brotlicffi'):
+        return 'br, gzip, deflate'
+    return 'gzip, deflate'
+
+
+def http2_available() -> bool:
+    return _installed('httpx', 'h2')
+
+
+# --- Connection timing ---
+
+_local = threading.local()
+
+
+def take_connect_timing() -> Dict[str, float]:
+    """{'dns', 'connect', 'tls'} seconds for the connection opened by this thread's last request, then clear it.
+
+    Empty when the request was served on a kept-alive connection.
+    """
+    timing = getattr(_local, 'timing', None)
+    _local.timing = None
+    return timing or {}
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        # Resolve here so DNS is timed apart from the TCP connect, then let urllib3 connect to each address in turn,
+        # moving on like its create_connection does when one times out, is refused or is unreachable
+        host = self._dns_host
+        t0 = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in
+                                           socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)))
+        except OSError:
+            addresses = [host]  # urllib3 raises its own resolution error
+        t1 = time.perf_counter()
+        try:
+            for n, address in enumerate(addresses, 1):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (ConnectTimeoutError, NewConnectionError, OSError):
+                    if n == len(addresses):
+                        raise
+        finally:
+            self._dns_host = host
+        _local.timing = {'dns': t1 - t0, 'connect': time.perf_counter() - t1, 'tls': 0.0}
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        t0 = time.perf_counter()
+        super().connect()
+        timing = getattr(_local, 'timing', None)
+        if timing:
+            timing['tls'] = max(0.0, time.perf_counter() - t0 - timing['dns'] - timing['connect'])
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record their DNS, connect and TLS times."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _TimedHTTPConnectionPool, 'https': _TimedHTTPSConnectionPool}
+
+
+class _Http2Body:
+    """Minimal file-like wrapper so requests.Response can read an httpx stream."""
+
+    def __init__(self, response):
+        self._response = response
+
+    def stream(self, chunk_size: int = 1024, decode_content: bool = True):
+        yield from self._response.iter_bytes(chunk_size)
+
+    def tell(self) -> int:
+        """Bytes received on the wire so far, like urllib3's HTTPResponse.tell()."""
+        return self._response.num_bytes_downloaded
+
+    def close(self):
+        self._response.close()
+
+
+class Http2Adapter(BaseAdapter):
+    """requests transport adapter backed by an HTTP/2-capable httpx.Client."""
+
+    def __init__(self, max_connections: int = DEFAULT_POOL_MAXSIZE):
+        super().__init__()
+        import httpx
+        self._httpx = httpx
+        self.client = httpx.Client(http2=True, follow_redirects=False,
+                                   limits=httpx.Limits(max_connections=DEFAULT_POOL_HOSTS * max_connections,
+                                                       max_keepalive_connections=DEFAULT_POOL_HOSTS * max_connections))
+        self._lock = threading.Lock()
+        self._requests: Dict[str, int] = {}
+        self._streams: Dict[str, set] = {}
+        self._versions: Dict[str, str] = {}
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(timeout)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        httpx = self._httpx
+        try:
+            hreq = self.client.build_request(request.method, request.url, headers=dict(request.headers),
+                                             content=request.body, timeout=self._timeout(timeout))
+            hresp = self.client.send(hreq, stream=True)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+        host = urlsplit(request.url).hostname or ''
+        with self._lock:
+            self._requests[host] = self._requests.get(host, 0) + 1
+            network_stream = hresp.extensions.get('network_stream')
+            if network_stream is not None:
+                self._streams.setdefault(host, set()).add(network_stream)
+            self._versions[host] = hresp.http_version
+        resp = requests.Response()
+        resp.status_code = hresp.status_code
+        resp.reason = hresp.reason_phrase
+        # httpx hands out decoded bytes, so the stale encoding headers must not reach requests
+        resp.headers = CaseInsensitiveDict((k, v) for k, v in hresp.headers.items()
+                                           if k.lower() not in ('content-encoding', 'content-length'))
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        resp.raw = _Http2Body(hresp)
+        resp.url = str(hresp.url)
+        resp.request = request
+        resp.connection = self
+        return resp
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {host: {'requests': count, 'connections': len(self._streams.get(host, ())),
+                           'protocol': self._versions.get(host, '')}
+                    for host, count in self._requests.items()}
+
+    def close(self):
+        self.client.close()
+
+
+class HttpClient:
+    def __init__(self, user_agent: Optional[str] = None, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 http2: bool = False):
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': user_agent or DEFAULT_USER_AGENT,
+            'Accept-Encoding': accept_encoding(),
+        })
+        self.http2 = http2 and http2_available()
+        if self.http2:
+            self.adapter = Http2Adapter(max(1, pool_maxsize))
+        else:
+            # pool_block=False: a request over the limit opens an extra connection instead of waiting
+            self.adapter = TimedHTTPAdapter(pool_connections=DEFAULT_POOL_HOSTS, pool_maxsize=max(1, pool_maxsize))
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+    def warm(self, urls: Iterable[str], timeout: float = WARM_TIMEOUT) -> int:
+        """Open one keep-alive connection per origin in parallel with a HEAD request; returns how many opened.
+
+        Warm-up requests bypass the rate limiter; failures are ignored and left to the real requests.
+        """
+        origins = sorted({f"{p.scheme}://{p.netloc}/" for p in map(urlsplit, urls) if p.netloc})
+        if not origins:
+            return 0
+
+        def _open(origin):
+            try:
+                self.session.head(origin, timeout=timeout, allow_redirects=False).close()
+                return True
+            except requests.RequestException:
+                return False
+
+        with ThreadPoolExecutor(max_workers=len(origins)) as pool:
+            return sum(pool.map(_open, origins))
+
+    def connection_stats(self) -> Dict[str, Dict[str, object]]:
+        """Per host: requests sent, connections opened, requests served on an already open connection."""
+        if self.http2:
+            stats = self.adapter.stats()
+        else:
+            stats = {}
+            pools = self.adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None or not pool.num_requests:
+                    continue
+                entry = stats.setdefault(pool.host, {'requests': 0, 'connections': 0, 'protocol': 'HTTP/1.1'})
+                entry['requests'] += pool.num_requests
+                entry['connections'] += pool.num_connections
+        for entry in stats.values():
+            entry['reused'] = max(0, entry['requests'] - entry['connections'])
+        return stats
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Run metrics for fetch_all.py.
+
+BaseScraper fills one record per fetched URL (time spent queued behind the
+host limits, DNS, TCP connect, TLS, time to first byte, total download time,
+bytes on the wire, retries, parse time and items parsed) and the runner times
+every scraper's run() and its JSON writes. At the end of a run RunMetrics
+writes to the metrics directory:
+  run-report.json   this run: per-scraper totals and every request record
+  fetch_all.prom    per-scraper totals in the Prometheus textfile format
+  history.jsonl     one line of per-scraper totals per run, newest last,
+                    trimmed to HISTORY_RUNS lines and used for trend lines
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List
+
+DEFAULT_METRICS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'metrics')
+HISTORY_RUNS = 50
+# Per-request timings in seconds
+PHASES = ('queued', 'dns', 'connect', 'tls', 'ttfb', 'total')
+PROM_PREFIX = 'asstar_fetch'
+
+
+def new_request(scraper: str, url: str) -> Dict[str, Any]:
+    return {
+        'scraper': scraper, 'url': url, 'status': None, 'error': None,
+        **dict.fromkeys(PHASES, 0.0),
+        'bytes': 0, 'retries': 0, 'newConnection': False, 'revalidated': False, 'streamed': False,
+        'parse': 0.0, 'parseCached': False, 'items': 0,
+    }
+
+
+def count_items(result: Any) -> int:
+    """Records in a parse result: list length, summed over dicts and over {'items': [...]} sections."""
+    if isinstance(result, dict):
+        return sum(count_items(v) for v in result.values())
+    if isinstance(result, list):
+        if result and all(isinstance(x, dict) and 'items' in x for x in result):
+            return sum(count_items(x['items']) for x in result)
+        return len(result)
+    return 0
+
+
+def _write_atomic(path: str, text: str):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class RunMetrics:
+    def __init__(self):
+        self.started = datetime.now()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.requests: List[Dict[str, Any]] = []
+        self.scrapers: Dict[str, Dict[str, Any]] = {}
+
+    def _scraper(self, name: str) -> Dict[str, Any]:
+        return self.scrapers.setdefault(name, {'status': 'ok', 'error': None, 'duration': 0.0,
+                                               'write': 0.0, 'outputs': []})
+
+    def record_request(self, record: Dict[str, Any]):
+        with self._lock:
+            self.requests.append(record)
+
+    def record_write(self, scraper: str, filename: str, seconds: float):
+        with self._lock:
+            entry = self._scraper(scraper)
+            entry['write'] += seconds
+            entry['outputs'].append(filename)
+
+    @contextmanager
+    def scraper(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Time one scraper run; an exception marks it failed and is re-raised."""
+        with self._lock:
+            entry = self._scraper(name)
+        t0 = time.perf_counter()
+        try:
+            yield entry
+        except Exception as e:
+            entry.update(status='error', error=str(e))
+            raise
+        finally:
+            entry['duration'] = time.perf_counter() - t0
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-scraper totals; request timings are summed over the scraper's requests."""
+        with self._lock:
+            requests = list(self.requests)
+            scrapers = {name: dict(entry) for name, entry in self.scrapers.items()}
+        for name, entry in scrapers.items():
+            mine = [r for r in requests if r['scraper'] == name]
+            entry.update({
+                'requests': len(mine),
+                'failedRequests': sum(1 for r in mine if r['error']),
+                'retries': sum(r['retries'] for r in mine),
+                'bytes': sum(r['bytes'] for r in mine),
+                'newConnections': sum(1 for r in mine if r['newConnection']),
+                'revalidated': sum(1 for r in mine if r['revalidated']),
+                'items': sum(r['items'] for r in mine),
+                'parse': sum(r['parse'] for r in mine),
+                **{phase: sum(r[phase] for r in mine) for phase in PHASES},
+            })
+        return scrapers
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'startedAt': self.started.isoformat(),
+            'duration': time.perf_counter() - self._t0,
+            'scrapers': self.summary(),
+            'requests': list(self.requests),
+        }
+
+    @staticmethod
+    def prometheus(report: Dict[str, Any]) -> str:
+        lines = []
+
+        def metric(name: str, help_text: str, samples: List[tuple]):
+            lines.append(f"# HELP {PROM_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROM_PREFIX}_{name} gauge")
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{PROM_PREFIX}_{name}{{{label_text}}} {float(value)!r}" if label_text
+                             else f"{PROM_PREFIX}_{name} {float(value)!r}")
+
+        scrapers = report['scrapers']
+        started = datetime.fromisoformat(report['startedAt']).timestamp()
+        metric('run_timestamp_seconds', "Start of the last fetch_all.py run.", [({}, started)])
+        metric('run_duration_seconds', "Wall time of the last fetch_all.py run.", [({}, report['duration'])])
+        per_scraper = [
+            ('scraper_success', "1 when the scraper finished without error.", lambda e: e['status'] == 'ok'),
+            ('scraper_duration_seconds', "Wall time of the scraper's run().", lambda e: e['duration']),
+            ('scraper_requests', "Requests made by the scraper.", lambda e: e['requests']),
+            ('scraper_failed_requests', "Requests that failed after all retries.", lambda e: e['failedRequests']),
+            ('scraper_retries', "Retried request attempts.", lambda e: e['retries']),
+            ('scraper_bytes', "Response bytes received on the wire.", lambda e: e['bytes']),
+            ('scraper_items', "Items parsed.", lambda e: e['items']),
+            ('scraper_parse_seconds', "Time spent parsing, summed over requests.", lambda e: e['parse']),
+            ('scraper_write_seconds', "Time spent writing output JSON.", lambda e: e['write']),
+        ]
+        for name, help_text, value in per_scraper:
+            metric(name, help_text, [({'scraper': s}, float(value(e))) for s, e in sorted(scrapers.items())])
+        metric('scraper_phase_seconds', "Request time by phase, summed over the scraper's requests.",
+               [({'scraper': s, 'phase': p}, e[p]) for s, e in sorted(scrapers.items()) for p in PHASES])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: str = DEFAULT_METRICS_DIR) -> List[str]:
+        """Write the report files and append this run to the history; returns trend lines vs. earlier runs."""
+        os.makedirs(directory, exist_ok=True)
+        report = self.report()
+        _write_atomic(os.path.join(directory, 'run-report.json'), json.dumps(report, indent=2, ensure_ascii=False))
+        _write_atomic(os.path.join(directory, 'fetch_all.prom'), self.prometheus(report))
+
+        history_path = os.path.join(directory, 'history.jsonl')
+        history = []
+        if os.path.exists(history_path):
+            with open(history_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        history.append(json.loads(line))
+                    except ValueError:
+                        continue
+        totals = ('duration', 'requests', 'retries', 'bytes', 'items', 'parse', 'write', 'ttfb', 'total')
+        run = {
+            'startedAt': report['startedAt'], 'duration': report['duration'],
+            'scrapers': {name: {'status': e['status'], **{k: e[k] for k in totals}}
+                         for name, e in report['scrapers'].items()},
+        }
+        kept = (history + [run])[-HISTORY_RUNS:]
+        _write_atomic(history_path, ''.join(json.dumps(h, ensure_ascii=False) + '\n' for h in kept))
+        return self.trend(report, history)
+
+    @staticmethod
+    def trend(report: Dict[str, Any], history: List[Dict[str, Any]]) -> List[str]:
+        lines = []
+        for name, entry in sorted(report['scrapers'].items()):
+            previous = [h['scrapers'][name]['duration'] for h in history
+                        if h.get('scrapers', {}).get(name, {}).get('status') == 'ok']
+            line = (f"{name}: {entry['duration']:.2f}s, {entry['requests']} requests, {entry['retries']} retries, "
+                    f"{entry['bytes'] / 1024:.0f} KB, ttfb {entry['ttfb']:.2f}s, parse {entry['parse']:.2f}s, "
+                    f"write {entry['write']:.2f}s, {entry['items']} items")
+            if previous:
+                median = statistics.median(previous)
+                change = (entry['duration'] - median) / median if median else 0.0
+                line += f" (median of last {len(previous)} runs {median:.2f}s, {change:+.0%})"
+            lines.append(line)
+        return lines
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+HTML parser backends shared by the scrapers.
+
+Backends:
+- html.parser: BeautifulSoup with the pure-Python html.parser builder
+- soup:        BeautifulSoup with the lxml builder
+- strained:    BeautifulSoup + lxml, restricted with a SoupStrainer so only the
+               card subtrees are built
+- lxml:        raw lxml.html tree queried with XPath
+
+The three BeautifulSoup backends hand out bs4 Tags (kind == 'soup') and can
+share the same extraction code; the lxml backend hands out lxml elements
+(kind == 'lxml') and is used with the lx_* helpers below, which mirror
+BeautifulSoup's get_text(strip=True) semantics.
+
+lxml and bs4 are imported by the backends that use them, on first use, so a
+scraper on the lxml backend never loads bs4.
+"""
+
+import codecs
+import json
+import re
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, SoupStrainer
+
+BACKENDS = ('html.parser', 'soup', 'strained', 'lxml')
+
+
+def class_regex(css_class: str) -> 're.Pattern[str]':
+    """Match one class token against a raw class attribute (SoupStrainer sees the unsplit string)."""
+    return re.compile(rf'(?:^|\s){re.escape(css_class)}(?:\s|$)')
+
+
+def has_class(css_class: str) -> str:
+    """XPath predicate body equivalent to the CSS class selector .css_class."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {css_class} ")'
+
+
+class CardSpec(NamedTuple):
+    """How to locate the repeated cards of a page in each backend."""
+    css: str
+    xpath: str
+    strain_name: Any = None
+    strain_attrs: Optional[Dict[str, Any]] = None
+
+    def strainer(self) -> 'SoupStrainer':
+        from bs4 import SoupStrainer
+        return SoupStrainer(self.strain_name, attrs=self.strain_attrs or {})
+
+
+class SoupBackend:
+    kind = 'soup'
+
+    def __init__(self, name: str = 'soup', features: str = 'lxml', strained: bool = False):
+        self.name = name
+        self.features = features
+        self.strained = strained
+
+    def parse(self, html: str, spec: Optional[CardSpec] = None) -> 'BeautifulSoup':
+        from bs4 import BeautifulSoup
+        if self.strained and spec is not None:
+            return BeautifulSoup(html, self.features, parse_only=spec.strainer())
+        return BeautifulSoup(html, self.features)
+
+    def cards(self, root: 'BeautifulSoup', spec: CardSpec) -> List[Any]:
+        return root.select(spec.css)
+
+
+class LxmlBackend:
+    kind = 'lxml'
+    name = 'lxml'
+
+    def parse(self, html: str, spec: Optional[CardSpec] = None):
+        import lxml.html
+        if not html or not html.strip():
+            return lxml.html.fromstring('<html></html>')
+        return lxml.html.fromstring(html)
+
+    def cards(self, root, spec: CardSpec) -> List[Any]:
+        return root.xpath(spec.xpath)
+
+
+def get_backend(name: str):
+    if name == 'html.parser':
+        return SoupBackend(name, 'html.parser')
+    if name == 'soup':
+        return SoupBackend(name, 'lxml')
+    if name == 'strained':
+        return SoupBackend(name, 'lxml', strained=True)
+    if name == 'lxml':
+        return LxmlBackend()
+    raise ValueError(f"Unknown parser backend '{name}', expected one of {', '.join(BACKENDS)}")
+
+
+# --- lxml helpers ---
+
+_SKIP_TEXT_TAGS = frozenset(('script', 'style', 'template'))
+
+
+def lx_strings(el) -> Iterator[str]:
+    """Text nodes of el in document order, skipping comments, scripts and styles like bs4 does."""
+    if el.text and isinstance(el.tag, str):
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str) and child.tag not in _SKIP_TEXT_TAGS:
+            yield from lx_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def lx_text(el, separator: str = '') -> str:
+    """Equivalent of Tag.get_text(separator, strip=True)."""
+    if el is None:
+        return ''
+    return separator.join(s for s in (t.strip() for t in lx_strings(el)) if s)
+
+
+def lx_first(el, xpath: str):
+    found = el.xpath(xpath)
+    return found[0] if found else None
+
+
+# --- Streaming extraction ---
+
+_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+
+def header_charset(headers) -> Optional[str]:
+    """Charset declared in the Content-Type header, or None to let the parser sniff <meta charset>."""
+    match = _CHARSET_RE.search(headers.get('Content-Type', '') or '')
+    return match.group(1) if match else None
+
+
+def text_chunks(text: str, size: int) -> Iterator[str]:
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def iter_stream_elements(chunks: Iterable[Union[bytes, str]], tag: str, encoding: Optional[str] = None) -> Iterator[Any]:
+    """Yield each completed <tag> element while the document is still being fed in.
+
+    Stopping the iteration early leaves the rest of the input unread and unparsed.
+    """
+    from lxml import etree
+    parser = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if parser is None:
+            # An explicit encoding only applies to byte input
+            kwargs = {'encoding': encoding} if encoding and isinstance(chunk, bytes) else {}
+            parser = etree.HTMLPullParser(events=('end',), tag=tag, **kwargs)
+        parser.feed(chunk)
+        for _, el in parser.read_events():
+            yield el
+    if parser is not None:
+        parser.close()
+        for _, el in parser.read_events():
+            yield el
+
+
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+_JSON_DELIMITERS = frozenset(' \t\n\r,]')
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]], encoding: Optional[str] = None) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array as soon as each one has been read completely.
+
+    Only the element being decoded is buffered, and stopping the iteration early leaves the rest unread.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = None
+    buf, pos, started, after_element = '', 0, False, False
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            text_decoder = text_decoder or codecs.getincrementaldecoder(encoding or 'utf-8')()
+            chunk = text_decoder.decode(chunk)
+        buf, pos = buf[pos:] + chunk, 0
+        while True:
+            pos = _JSON_WS.match(buf, pos).end()
+            if pos == len(buf):
+                break
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError(f"Expected a JSON array, got {buf[pos:pos + 40]!r}")
+                started, pos = True, pos + 1
+                continue
+            if buf[pos] == ']':
+                return
+            if after_element:
+                if buf[pos] != ',':
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {buf[pos:pos + 40]!r}")
+                comma, pos = pos, _JSON_WS.match(buf, pos + 1).end()
+                if pos == len(buf):
+                    pos = comma  # keep the comma so the next chunk resumes before it
+                    break
+                after_element = False
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # element continues in the next chunk
+            if not isinstance(value, (dict, list, str)) and buf[end:end + 1] not in _JSON_DELIMITERS:
+                break  # a number may continue in the next chunk ("2" of "2.5")
+            pos, after_element = end, True
+            yield value
+    raise ValueError("Truncated or malformed JSON array")  # the closing ] returns above
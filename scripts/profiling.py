@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+CPU and memory profiling for fetch_all.py --profile.
+
+Every scraper's run() is profiled with cProfile, and so are its fetch and
+parse phases (BaseScraper._download / get_streamed and parse_text) on their
+own. cProfile only sees the thread it was enabled in and one profiler per
+thread, so a phase pauses the enclosing run profiler instead of nesting, and
+the run profile is merged with its phases when written. tracemalloc records
+the peak memory of each phase and the allocations still held after run().
+
+Files written per scraper to the profile directory:
+  <scraper>.prof         the whole run() (fetch + parse + everything else)
+  <scraper>.fetch.prof   fetch phase only
+  <scraper>.parse.prof   parse phase only
+  <scraper>.tracemalloc  tracemalloc snapshot taken when run() returns
+The .prof files load with pstats or snakeviz; the snapshot with
+tracemalloc.Snapshot.load().
+"""
+
+import cProfile
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    import pstats
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'profiles')
+DEFAULT_TOP = 15
+PHASES = ('fetch', 'parse')
+
+
+class _Frame:
+    def __init__(self, key: Tuple[str, str], profile: cProfile.Profile):
+        self.key = key
+        self.profile = profile
+        self.base = tracemalloc.get_traced_memory()[0]
+        self.peak = self.base
+
+
+class Profiler:
+    def __init__(self, directory: str = DEFAULT_PROFILE_DIR, top: int = DEFAULT_TOP):
+        self.directory = directory
+        self.top = top
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles: Dict[Tuple[str, str], cProfile.Profile] = {}
+        self._peaks: Dict[Tuple[str, str], int] = {}
+        self._retained: Dict[str, List[tracemalloc.StatisticDiff]] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def _profiled(self, scraper: str, phase: str) -> Iterator[None]:
+        stack: List[_Frame] = self._local.__dict__.setdefault('stack', [])
+        key = (scraper, phase)
+        with self._lock:
+            profile = self._profiles.setdefault(key, cProfile.Profile())
+        if stack:
+            outer = stack[-1]
+            outer.profile.disable()
+            outer.peak = max(outer.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame = _Frame(key, profile)
+        stack.append(frame)
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            stack.pop()
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            with self._lock:
+                self._peaks[key] = max(self._peaks.get(key, 0), frame.peak - frame.base)
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, frame.peak)
+                stack[-1].profile.enable()
+
+    @contextmanager
+    def run(self, scraper: str) -> Iterator[None]:
+        """Profile one scraper's run() and snapshot the memory it still holds afterwards."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        try:
+            with self._profiled(scraper, 'run'):
+                yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            after.dump(os.path.join(self.directory, f"{scraper}.tracemalloc"))
+            self._retained[scraper] = after.compare_to(before, 'lineno')[:5]
+
+    def phase(self, scraper: str, phase: str):
+        return self._profiled(scraper, phase)
+
+    def _stats(self, scraper: str, phase: str):
+        profile = self._profiles.get((scraper, phase))
+        if profile is None:
+            return None
+        # Only needed for the report; fetch_all.py imports this module for its defaults on every run
+        import pstats
+        stats = pstats.Stats(profile)
+        if phase == 'run':
+            # The run profiler was paused during its phases; add them back for the whole picture
+            for name in PHASES:
+                if (scraper, name) in self._profiles:
+                    stats.add(self._profiles[(scraper, name)])
+        return stats
+
+    def hot_functions(self, stats: 'pstats.Stats') -> List[str]:
+        rows = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)[:self.top]
+        lines = [f"    {'self ms':>9} {'cum ms':>9} {'calls':>8}  function"]
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in rows:
+            where = f"{os.path.basename(filename)}:{line}" if line else filename
+            lines.append(f"    {tottime * 1000:>9.1f} {cumtime * 1000:>9.1f} {calls:>8}  {func} ({where})")
+        return lines
+
+    def report(self) -> List[str]:
+        """Write the .prof files and return the printable summary."""
+        lines = []
+        for scraper in sorted({s for s, _ in self._profiles}):
+            run = self._stats(scraper, 'run')
+            if run is None:
+                continue
+            run.dump_stats(os.path.join(self.directory, f"{scraper}.prof"))
+            cpu = [f"run {run.total_tt:.2f}s"]
+            memory = [f"run {self._peaks.get((scraper, 'run'), 0) / 1024 / 1024:.1f} MB"]
+            for phase in PHASES:
+                stats = self._stats(scraper, phase)
+                if stats is None:
+                    continue
+                stats.dump_stats(os.path.join(self.directory, f"{scraper}.{phase}.prof"))
+                cpu.append(f"{phase} {stats.total_tt:.2f}s")
+                memory.append(f"{phase} {self._peaks.get((scraper, phase), 0) / 1024 / 1024:.1f} MB")
+            lines.append(f"Profile {scraper}: profiled time {', '.join(cpu)}; peak memory {', '.join(memory)}")
+            lines.append(f"  Top {self.top} functions by self time:")
+            lines.extend(self.hot_functions(run))
+            retained = [d for d in self._retained.get(scraper, []) if d.size_diff > 0]
+            if retained:
+                lines.append("  Largest allocations still held after run():")
+                for diff in retained:
+                    frame = diff.traceback[0]
+                    lines.append(f"    {diff.size_diff / 1024:>9.1f} KB  {os.path.basename(frame.filename)}:{frame.lineno}")
+        lines.append(f"Profiles written to {self.directory}")
+        return lines
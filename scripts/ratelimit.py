@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Per-host token-bucket rate limiting and concurrency caps shared by all scrapers.
+
+Each host gets its own bucket, so requests to different hosts never wait on
+each other; requests to the same host wait only as long as the bucket needs
+to refill. HostLimiter separately caps how many requests to a host are in
+flight at once.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# host -> (tokens per second, burst)
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, int]] = {
+    'github.com': (1.0, 3),
+    'huggingface.co': (2.0, 4),
+    'tophub.today': (1.0, 3),
+    'finance.eastmoney.com': (1.0, 2),
+}
+DEFAULT_RATE: Tuple[float, int] = (1.0, 2)
+DEFAULT_MAX_PER_HOST = 2
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """Lazily creates one TokenBucket per host."""
+
+    def __init__(self, rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default: Tuple[float, int] = DEFAULT_RATE):
+        self.rates = dict(DEFAULT_HOST_RATES)
+        self.rates.update(rates or {})
+        self.default = default
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.rates.get(host, self.default)
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to url's host is allowed; returns seconds waited."""
+        return self.bucket(urlsplit(url).hostname or '').acquire()
+
+
+class HostLimiter:
+    """Caps the number of in-flight requests per host, shared by all scrapers."""
+
+    def __init__(self, max_per_host: int = DEFAULT_MAX_PER_HOST):
+        self.max_per_host = max(1, max_per_host)
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    def slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            sem = self._slots.get(host)
+            if sem is None:
+                sem = self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return sem
+
+
+def parse_rate_spec(spec: str) -> Tuple[str, Tuple[float, int]]:
+    """Parse 'host=rate[:burst]', e.g. 'github.com=0.5:2'."""
+    host, _, value = spec.partition('=')
+    if not host or not value:
+        raise ValueError(f"Invalid rate spec '{spec}', expected host=rate[:burst]")
+    rate, _, burst = value.partition(':')
+    return host.strip(), (float(rate), int(burst) if burst else DEFAULT_RATE[1])
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Typed feed records shared by the scrapers.
+
+Repo, Model, Paper and NewsItem are slotted dataclasses holding raw counts as
+ints; to_dict() gives the JSON record written to the feeds (camelCase keys,
+counts unformatted) and the pages format numbers when rendering. Every feed
+document carries "schemaVersion": SCHEMA_VERSION:
+
+  1 (no schemaVersion)  counts as formatted strings ("12,345"), Tophub ranks
+                        as strings ("1", "" for EastMoney)
+  2                     counts as ints, ranks as ints or null
+
+from_dict() reads either version, and upgrade() converts a whole version 1
+document in place by rewriting only the count fields of its records, so an
+old feed (e.g. the carried-over Tophub categories) costs one walk to convert.
+
+Usage:
+  python3 scripts/records.py feeds/*.json    # upgrade feed files in place
+"""
+
+import argparse
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+SCHEMA_VERSION = 2
+# Record fields holding counts (ints from version 2 on) and their defaults
+COUNT_FIELDS = {'stars': 0, 'forks': 0, 'starsToday': 0, 'likes': 0, 'downloads': 0, 'upvotes': 0, 'rank': None}
+NON_DIGITS = re.compile(r'[^\d]')
+
+
+def parse_count(value: Any, default: Optional[int] = 0) -> Optional[int]:
+    """A count from a page, API or version 1 feed: 1234, "1,234" and "1,234 stars today" all give 1234."""
+    if isinstance(value, bool):
+        return default
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    digits = NON_DIGITS.sub('', value) if isinstance(value, str) else ''
+    return int(digits) if digits else default
+
+
+@dataclass(slots=True)
+class Repo:
+    name: str
+    url: str
+    description: str = 'No description available'
+    language: str = 'Unknown'
+    stars: int = 0
+    forks: int = 0
+    stars_today: int = 0
+    built_by: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'description': self.description, 'language': self.language,
+                'stars': self.stars, 'forks': self.forks, 'starsToday': self.stars_today,
+                'url': self.url, 'builtBy': self.built_by}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'Repo':
+        return cls(name=d['name'], url=d['url'], description=d.get('description') or 'No description available',
+                   language=d.get('language') or 'Unknown', stars=parse_count(d.get('stars')),
+                   forks=parse_count(d.get('forks')), stars_today=parse_count(d.get('starsToday')),
+                   built_by=list(d.get('builtBy') or []))
+
+
+@dataclass(slots=True)
+class Model:
+    name: str
+    url: str
+    description: str = 'No description available'
+    task: str = 'Unknown'
+    parameters: str = 'Unknown'
+    likes: int = 0
+    downloads: int = 0
+    tags: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'description': self.description, 'task': self.task, 'parameters': self.parameters,
+                'likes': self.likes, 'downloads': self.downloads, 'url': self.url, 'tags': self.tags}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'Model':
+        return cls(name=d['name'], url=d['url'], description=d.get('description') or 'No description available',
+                   task=d.get('task') or 'Unknown', parameters=d.get('parameters') or 'Unknown',
+                   likes=parse_count(d.get('likes')), downloads=parse_count(d.get('downloads')),
+                   tags=list(d.get('tags') or []))
+
+    @classmethod
+    def from_api(cls, item: Dict[str, Any]) -> Optional['Model']:
+        """Map a HuggingFace /api/models listing item; None when it has no id."""
+        model_id = item.get('modelId') or item.get('id') or ''
+        if not model_id:
+            return None
+        card = item.get('cardData') or {}
+        tags = item.get('tags') if isinstance(item.get('tags'), list) else card.get('tags')
+        return cls(name=model_id, url=f"https://huggingface.co/{model_id}",
+                   description=item.get('description') or card.get('description') or 'No description available',
+                   task=item.get('pipeline_tag') or 'Unknown', parameters=card.get('parameters') or 'Unknown',
+                   likes=parse_count(item.get('likes')), downloads=parse_count(item.get('downloads')),
+                   tags=[t for t in tags or [] if isinstance(t, str)][:5])
+
+
+@dataclass(slots=True)
+class Paper:
+    title: str
+    url: str
+    authors: str = 'Unknown'
+    abstract: str = 'No abstract available.'
+    upvotes: int = 0
+    organization: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'title': self.title, 'authors': self.authors, 'abstract': self.abstract, 'url': self.url,
+                'upvotes': self.upvotes, 'organization': self.organization}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'Paper':
+        return cls(title=d['title'], url=d['url'], authors=d.get('authors') or 'Unknown',
+                   abstract=d.get('abstract') or 'No abstract available.', upvotes=parse_count(d.get('upvotes')),
+                   organization=d.get('organization'))
+
+
+@dataclass(slots=True)
+class NewsItem:
+    title: str
+    url: str
+    # Position on its board as shown there; None when the board shows none (EastMoney)
+    rank: Optional[int] = None
+    extra: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'rank': self.rank, 'title': self.title, 'extra': self.extra, 'url': self.url}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'NewsItem':
+        return cls(title=d.get('title') or '', url=d['url'], rank=parse_count(d.get('rank'), None),
+                   extra=d.get('extra') or '')
+
+
+def upgrade(data: Any) -> Any:
+    """Convert a feed document to SCHEMA_VERSION in place (a no-op when it already is); returns it."""
+    if not isinstance(data, dict) or data.get('schemaVersion') == SCHEMA_VERSION:
+        return data
+    _upgrade_records(data)
+    data['schemaVersion'] = SCHEMA_VERSION
+    return data
+
+
+def _upgrade_records(node: Any):
+    if isinstance(node, dict):
+        for key, default in COUNT_FIELDS.items():
+            if isinstance(node.get(key), str):
+                node[key] = parse_count(node[key], default)
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                _upgrade_records(value)
+    elif isinstance(node, list):
+        for value in node:
+            if isinstance(value, (dict, list)):
+                _upgrade_records(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert feed files to the current record schema in place")
+    parser.add_argument('paths', nargs='+', metavar='FEED', help="Feed JSON files, e.g. feeds/*.json")
+    args = parser.parse_args()
+    for path in args.paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get('schemaVersion') == SCHEMA_VERSION:
+            continue
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(upgrade(data), f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+        print(f"Upgraded {path} to schema version {SCHEMA_VERSION}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Scraper plugin registry for fetch_all.py.
+
+Scrapers are named by "module:Class" strings and only imported when one is
+selected, so `fetch_all.py github` loads neither the other scrapers nor the
+parsers they need. Built-in scrapers are listed in BUILTIN_SCRAPERS; other
+packages add theirs through the "asstar.scrapers" entry point group:
+
+  [project.entry-points."asstar.scrapers"]
+  weibo = "asstar_weibo:WeiboScraper"
+
+The class must subclass scraper.BaseScraper. A built-in name cannot be
+overridden by a plugin.
+
+Looking entry points up with importlib.metadata reads the metadata of every
+installed distribution, so the result is kept in .cache/plugins.json together
+with the modification times of the sys.path directories, and is only looked
+up again after a package has been installed or removed.
+"""
+
+import importlib
+import json
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+BUILTIN_SCRAPERS = {
+    'github': 'scraper_github:GitHubTrendingScraper',
+    'huggingface': 'scraper_huggingface:HuggingFaceScraper',
+    'papers': 'scraper_papers:HFPapersScraper',
+    'focus': 'scraper_focus:TophubScraper',
+}
+ENTRY_POINT_GROUP = 'asstar.scrapers'
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'plugins.json')
+
+
+def _fingerprint() -> List[List]:
+    """(path, mtime) of every sys.path directory; installing or removing a distribution changes its directory's mtime."""
+    entries = []
+    for path in sys.path:
+        try:
+            entries.append([path, os.stat(path or '.').st_mtime_ns])
+        except OSError:
+            continue
+    return entries
+
+
+def discover(cache_path: Optional[str] = DEFAULT_CACHE_PATH) -> Dict[str, str]:
+    """{name: "module:Class"} of the scrapers registered through entry points."""
+    fingerprint = _fingerprint()
+    if cache_path:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('group') == ENTRY_POINT_GROUP and cached.get('fingerprint') == fingerprint:
+                return cached['plugins']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+    from importlib.metadata import entry_points
+    plugins = {ep.name: ep.value for ep in entry_points(group=ENTRY_POINT_GROUP)}
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp = cache_path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'group': ENTRY_POINT_GROUP, 'fingerprint': fingerprint, 'plugins': plugins}, f, indent=2)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+    return plugins
+
+
+def scrapers(cache_path: Optional[str] = DEFAULT_CACHE_PATH) -> Dict[str, str]:
+    """Every scraper name with its "module:Class" spec; built-ins first, in their usual order."""
+    plugins = discover(cache_path)
+    return {**BUILTIN_SCRAPERS, **{name: plugins[name] for name in sorted(plugins) if name not in BUILTIN_SCRAPERS}}
+
+
+@lru_cache(maxsize=None)
+def load(spec: str) -> type:
+    """Import the scraper class named by a "module:Class" spec."""
+    module_name, _, attr = spec.partition(':')
+    obj = importlib.import_module(module_name)
+    for part in filter(None, attr.split('.')):
+        obj = getattr(obj, part)
+    from scraper import BaseScraper
+    if not (isinstance(obj, type) and issubclass(obj, BaseScraper)):
+        raise TypeError(f"{spec} is not a BaseScraper subclass")
+    return obj
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Retry policy and per-host circuit breakers shared by all scrapers.
+
+- Errors are classified first: connection errors, timeouts and
+  408/425/429/500/502/503/504 responses are retried; other statuses (404,
+  403, 501, 505, 507, 511, ...) and errors raised while handling a response
+  are not.
+- Retries wait exponentially longer with jitter (half to all of
+  base * 2^(attempt-1), capped), or as long as the server's Retry-After asks,
+  up to max_retry_after; a longer Retry-After is not waited out at all.
+- Each host has a circuit breaker. After `threshold` consecutive retryable
+  failures, or a Retry-After beyond max_retry_after, it opens and every
+  request to that host fails immediately with CircuitOpenError until the
+  cooldown has passed; then a single probe request is let through and its
+  outcome closes or re-opens the breaker.
+- A caller can pass a cancel event: once it is set no further attempt is
+  made (Cancelled is raised) and a pending backoff wait ends early.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from transport import ReplayMiss
+
+RETRYABLE_STATUS = frozenset((408, 425, 429, 500, 502, 503, 504))
+DEFAULT_BREAKER_THRESHOLD = 3
+DEFAULT_BREAKER_COOLDOWN = 60.0
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """The host's circuit breaker is open; the request was not sent."""
+
+
+class Cancelled(Exception):
+    """The caller's cancel event was set; the request was not sent."""
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds requested by the Retry-After header of a failed response, if any."""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        # No response: raised by our own code for a transient condition (e.g. a 304 without a cache entry)
+        return response is None or response.status_code in RETRYABLE_STATUS
+    # ConnectionError, Timeout, ChunkedEncodingError, ... but not a missing replay fixture
+    return isinstance(error, requests.RequestException) and not isinstance(error, ReplayMiss)
+
+
+class RetryPolicy:
+    def __init__(self, base: float = 1.0, cap: float = 30.0, max_retry_after: float = 30.0):
+        self.base = base
+        self.cap = cap
+        self.max_retry_after = max_retry_after
+
+    def delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """Seconds to wait before attempt + 1, or None when error should not be retried."""
+        if not is_retryable(error):
+            return None
+        backoff = min(self.cap, self.base * 2 ** (attempt - 1))
+        backoff = random.uniform(backoff / 2, backoff)
+        requested = retry_after(error)
+        if requested is None:
+            return backoff
+        if requested > self.max_retry_after:
+            return None
+        return max(backoff, requested)
+
+
+class CircuitBreaker:
+    def __init__(self, host: str, threshold: int = DEFAULT_BREAKER_THRESHOLD, cooldown: float = DEFAULT_BREAKER_COOLDOWN):
+        self.host = host
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened = 0
+        self._open_until = 0.0
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._open_until > time.monotonic() or self._probing
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent; lets one probe through after the cooldown."""
+        with self._lock:
+            if not self._open_until:
+                return
+            remaining = self._open_until - time.monotonic()
+            if remaining <= 0 and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError(f"Circuit open for {self.host} after {self.failures} failures"
+                                   + (f", retry in {remaining:.0f}s" if remaining > 0 else ", probe in progress"))
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._open_until = 0.0
+            self._probing = False
+
+    def record_failure(self, cooldown: Optional[float] = None):
+        """Count a retryable failure; cooldown opens the breaker at once for that long (e.g. a long Retry-After)."""
+        with self._lock:
+            self.failures += 1
+            if cooldown is not None or self._probing or self.failures >= self.threshold:
+                if not self._open_until or self._probing:
+                    self.opened += 1
+                self._open_until = time.monotonic() + max(cooldown or 0.0, self.cooldown)
+                self._probing = False
+
+
+class CircuitBreakers:
+    """Lazily creates one CircuitBreaker per host."""
+
+    def __init__(self, threshold: int = DEFAULT_BREAKER_THRESHOLD, cooldown: float = DEFAULT_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(host, self.threshold, self.cooldown)
+            return breaker
+
+    def tripped(self) -> List[CircuitBreaker]:
+        with self._lock:
+            return [b for b in self._breakers.values() if b.opened]
+
+
+def call_with_retries(fn: Callable[[], Any], url: str, attempts: int, policy: RetryPolicy,
+                      breakers: Optional[CircuitBreakers] = None,
+                      on_retry: Optional[Callable[[int, BaseException, float], None]] = None,
+                      sleep: Callable[[float], Any] = time.sleep,
+                      cancel: Optional[threading.Event] = None) -> Any:
+    """Call fn up to attempts times under policy; on_retry(attempt, error, delay) runs before each wait.
+
+    sleep does the waiting; pass e.g. cancel.wait to make the backoff interruptible. Once cancel is set,
+    Cancelled is raised instead of making another attempt.
+    """
+    breaker = breakers.get(url) if breakers else None
+    for attempt in range(1, attempts + 1):
+        if cancel is not None and cancel.is_set():
+            raise Cancelled(url)
+        if breaker:
+            breaker.before_request()
+        try:
+            result = fn()
+        except Exception as e:
+            delay = policy.delay(attempt, e)
+            if breaker:
+                if is_retryable(e):
+                    requested = retry_after(e)
+                    long_wait = requested is not None and requested > policy.max_retry_after
+                    breaker.record_failure(requested if long_wait else None)
+                elif not isinstance(e, CircuitOpenError):
+                    # Not the host's fault (a 404, a parse error, ...): the host answered, so it is up
+                    breaker.record_success()
+            if delay is None or attempt == attempts or (breaker and breaker.is_open):
+                raise
+            if on_retry:
+                on_retry(attempt, e, delay)
+            sleep(delay)
+        else:
+            if breaker:
+                breaker.record_success()
+            return result
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+BaseScraper: the fetch, parse and write plumbing shared by every scraper.
+
+Everything a run shares (host limiter, rate limiter, retry policy, cache,
+transport, HTTP client, metrics, profiler, parse pool) is a class attribute
+that fetch_all.py sets up before any scraper is created. Scrapers subclass
+BaseScraper, set `name` (their CLI target) and implement run(); registry.py
+maps each name to its class.
+"""
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from artifacts import ArtifactWriter, artifact_path, compact, remove_artifacts
+from charsets import CharsetResolver
+from delta import DeltaPublisher
+from httpcache import ResponseCache
+from httpclient import HttpClient, take_connect_timing
+from metrics import RunMetrics, count_items, new_request
+from parsing import get_backend, header_charset
+from profiling import Profiler
+from records import SCHEMA_VERSION
+from ratelimit import HostLimiter, RateLimiter
+from retry import Cancelled, CircuitBreakers, RetryPolicy, call_with_retries
+from snapshots import Observation, SnapshotStore
+from transport import Transport
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+class BaseScraper:
+    host_limiter = HostLimiter()
+    rate_limiter = RateLimiter()
+    retry_policy = RetryPolicy()
+    breakers = CircuitBreakers()
+    cache: Optional[ResponseCache] = None
+    transport: Transport = Transport()
+    # Created on first use when fetch_all.py has not set one up (e.g. a scraper used on its own)
+    client: Optional[HttpClient] = None
+    charsets = CharsetResolver()
+    metrics: Optional[RunMetrics] = None
+    profiler: Optional[Profiler] = None
+    parse_pool: Optional[ProcessPoolExecutor] = None
+    deltas: Optional[DeltaPublisher] = None
+    artifacts: Optional[ArtifactWriter] = None
+    snapshots: Optional[SnapshotStore] = None
+
+    # CLI target name, also used to label metrics
+    name = ''
+    default_backend = 'soup'
+    # Origins requested by run(), opened ahead of time by HttpClient.warm()
+    origins: Tuple[str, ...] = ()
+
+    def __init__(self, user_agent: Optional[str] = None, backend: Optional[str] = None):
+        self.backend = get_backend(backend or self.default_backend)
+        self.headers = {'User-Agent': user_agent} if user_agent else {}
+        self.timeout = 30
+        self.max_retries = 3
+
+    @classmethod
+    def configure(cls, args: Any):
+        """Apply this scraper's fetch_all.py options (the parsed argparse namespace) before it is created."""
+
+    @property
+    def session(self) -> requests.Session:
+        if BaseScraper.client is None:
+            BaseScraper.client = HttpClient()
+        return BaseScraper.client.session
+
+    def _request(self, url: str, headers: Optional[Dict[str, str]] = None, stream: bool = False,
+                 record: Optional[Dict[str, Any]] = None) -> requests.Response:
+        headers = {**self.headers, **headers} if headers else self.headers
+        t0 = time.perf_counter()
+        with self.host_limiter.slot(url):
+            if not self.transport.offline:
+                self.rate_limiter.acquire(url)
+            queued = time.perf_counter() - t0
+            resp = self.transport.send(self.session, url, headers=headers or None, timeout=self.timeout, stream=stream)
+        if record is not None:
+            timing = take_connect_timing()
+            record.update(timing, status=resp.status_code, newConnection=bool(timing),
+                          queued=record['queued'] + queued, ttfb=resp.elapsed.total_seconds())
+        return resp
+
+    def _with_retries(self, url: str, attempt_fn: Callable[[], Any], record: Optional[Dict[str, Any]] = None,
+                      cancel: Optional[threading.Event] = None) -> Any:
+        """Run attempt_fn under the retry policy; once cancel is set no further attempt is made."""
+        def _on_retry(attempt, error, delay):
+            print(f"  Attempt {attempt} failed for {url}: {error}. Retrying in {delay:.1f}s...")
+            if record is not None:
+                record['retries'] += 1
+
+        if self.transport.offline:
+            if cancel is not None and cancel.is_set():
+                raise Cancelled(url)
+            return attempt_fn()
+        return call_with_retries(attempt_fn, url, self.max_retries, self.retry_policy, self.breakers, _on_retry,
+                                 sleep=cancel.wait if cancel is not None else time.sleep, cancel=cancel)
+
+    def _phase(self, phase: str):
+        """Profile a fetch or parse phase when running under --profile."""
+        return self.profiler.phase(self.name or type(self).__name__, phase) if self.profiler else nullcontext()
+
+    @contextmanager
+    def _measured(self, url: str) -> Iterator[Dict[str, Any]]:
+        """Metrics record for one fetch of url, filed with the run metrics once the fetch is done."""
+        record = new_request(self.name or type(self).__name__, url)
+        try:
+            yield record
+        except Exception as e:
+            record['error'] = str(e)
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.record_request(record)
+
+    @staticmethod
+    def _wire_bytes(resp: requests.Response) -> int:
+        """Bytes received on the wire, or the size of a body that was not read from a socket (replay)."""
+        tell = getattr(resp.raw, 'tell', None)
+        return (tell() if tell else 0) or len(resp._content or b'')
+
+    def _download(self, url: str, record: Optional[Dict[str, Any]] = None) -> Tuple[str, bool]:
+        """Returns (text, changed); changed is False when the cached body was revalidated with a 304."""
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+        record = record if record is not None else new_request(self.name, url)
+
+        def _attempt():
+            resp = self._request(url, headers=headers, record=record)
+            if resp.status_code == 304 and self.cache:
+                text = self.cache.revalidated(url)
+                if text is not None:
+                    record['revalidated'] = True
+                    return text, False
+                headers.clear()
+                raise requests.HTTPError(f"304 for {url} but cache entry is gone")
+            resp.raise_for_status()
+            # Ensure correct encoding for Tophub and others
+            resp.encoding = self.charsets.resolve(url, resp.headers, resp.content)
+            record['bytes'] += self._wire_bytes(resp)
+            text = resp.text
+            if self.cache:
+                self.cache.store(url, resp.headers, text)
+            return text, True
+
+        t0 = time.perf_counter()
+        try:
+            with self._phase('fetch'):
+                return self._with_retries(url, _attempt, record)
+        finally:
+            record['total'] = time.perf_counter() - t0
+
+    def _get_streamed(self, url: str, extract: Callable[..., Any], *args,
+                      cancel: Optional[threading.Event] = None) -> Tuple[Any, Optional[str]]:
+        """get_streamed() plus the next page's URL from the response's Link: rel="next" header, if any."""
+        with self._measured(url) as record:
+            record['streamed'] = True
+
+            def _attempt():
+                resp = self._request(url, stream=True, record=record)
+                try:
+                    resp.raise_for_status()
+                    result = extract(resp.iter_content(chunk_size=STREAM_CHUNK_SIZE), *args, encoding=header_charset(resp.headers))
+                    return result, resp.links.get('next', {}).get('url')
+                finally:
+                    record['bytes'] += self._wire_bytes(resp)
+                    resp.close()
+
+            t0 = time.perf_counter()
+            try:
+                with self._phase('fetch'):
+                    result = self._with_retries(url, _attempt, record, cancel)
+            finally:
+                # Download and extraction are interleaved, so both count towards total
+                record['total'] = time.perf_counter() - t0
+            record['items'] = count_items(result[0])
+            return result
+
+    def get_streamed(self, url: str, extract: Callable[..., Any], *args) -> Any:
+        """Stream url into extract(chunks, *args, encoding=...); the connection is closed as soon as extract returns.
+
+        Streamed responses bypass the conditional-request cache since extract may stop before the end of the body.
+        """
+        return self._get_streamed(url, extract, *args)[0]
+
+    def get_paginated(self, url: str, extract: Callable[..., Any], *args,
+                      cancel: Optional[threading.Event] = None) -> Iterator[Any]:
+        """Stream url and each page its Link: rel="next" header points to, yielding extract's result per page.
+
+        The next page is only requested once the caller asks for it, so stopping the iteration stops the crawl;
+        so does setting cancel (no further attempt or page is requested).
+        """
+        while url:
+            result, url = self._get_streamed(url, extract, *args, cancel=cancel)
+            yield result
+
+    def get(self, url: str) -> str:
+        with self._measured(url) as record:
+            return self._download(url, record)[0]
+
+    def parse_text(self, parse: Callable[..., Any], text: str, *args) -> Any:
+        """Run a parser method of this scraper, in the shared process pool when one is configured."""
+        if self.parse_pool is None:
+            with self._phase('parse'):
+                return parse(text, *args)
+        future = self.parse_pool.submit(_parse_in_worker, type(self), self.backend.name, parse.__name__, text, args)
+        return future.result()
+
+    def get_parsed(self, url: str, parse: Callable[..., Any], *args, key: Optional[str] = None) -> Any:
+        """Fetch url and parse it, reusing the cached parse result when the page is unchanged (304).
+
+        parse must be a method of this scraper taking (text, *args) and returning plain, picklable records.
+        """
+        with self._measured(url) as record:
+            text, changed = self._download(url, record)
+            # Results cached under an older record schema are never reused
+            key = key or f"{type(self).__name__}.{parse.__name__}@{SCHEMA_VERSION}" + (f":{args!r}" if args else '')
+            if not changed:
+                cached = self.cache.parsed(url, key)
+                if cached is not None:
+                    record.update(parseCached=True, items=count_items(cached))
+                    return cached
+            t0 = time.perf_counter()
+            result = self.parse_text(parse, text, *args)
+            record.update(parse=time.perf_counter() - t0, items=count_items(result))
+            if self.cache:
+                self.cache.store_parsed(url, key, result)
+            return result
+
+    def map_concurrent(self, fn: Callable[[Any], Any], items: List[Any], max_workers: Optional[int] = None) -> List[Any]:
+        """Apply fn to every item in parallel (at most max_workers at a time); results (or the raised exception) keep input order."""
+        def _call(item):
+            try:
+                return fn(item)
+            except Exception as e:
+                return e
+        if not items:
+            return []
+        if self.profiler:
+            # cProfile only sees the thread it runs in, so profiled runs fetch one item at a time
+            return [_call(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(len(items), max_workers or len(items))) as pool:
+            return list(pool.map(_call, items))
+
+    def fetch_many(self, urls: List[str]) -> List[Any]:
+        return self.map_concurrent(self.get, urls)
+
+    def observations(self, filename: str, data: Any) -> Iterable[Observation]:
+        """(source, item id, metric, value) snapshots of a feed this scraper writes; none unless overridden."""
+        return ()
+
+    def write_output(self, filename: str, data: Any):
+        """Write data as JSON into feeds/ (plus its compact variants, delta and snapshots when enabled), timing the
+        write for the run metrics.
+
+        A feed document (a dict) is stamped with the record schema version first.
+        """
+        t0 = time.perf_counter()
+        path = get_output_path(filename)
+        if isinstance(data, dict):
+            data = {'schemaVersion': SCHEMA_VERSION, **data}
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+        previous = None
+        if self.deltas and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                previous = f.read()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        artifacts = None
+        try:
+            if self.artifacts:
+                artifacts = self.artifacts.publish(path, data, len(text.encode('utf-8')))
+            else:
+                remove_artifacts(path)
+        except OSError as e:
+            print(f"  Failed to write the compact variants of {filename}: {e}")
+        if self.deltas:
+            try:
+                self.deltas.publish(path, previous, text, artifacts)
+            except OSError as e:
+                print(f"  Failed to publish the delta of {filename}: {e}")
+        if self.snapshots:
+            try:
+                self.snapshots.record(self.observations(filename, data))
+            except sqlite3.Error as e:
+                print(f"  Failed to record snapshots of {filename}: {e}")
+        if self.metrics:
+            self.metrics.record_write(self.name or type(self).__name__, filename, time.perf_counter() - t0)
+
+    def write_output_stream(self, filename: str, data: Dict[str, Any], key: str, items: Iterable[Any],
+                            count_key: Optional[str] = None) -> int:
+        """Write data as JSON into feeds/ with data[key] filled from items as they arrive, one item per line.
+
+        The list is never held in memory. The file is replaced only once items is exhausted, so a failed
+        crawl leaves the previous output in place. count_key, if given, records the item count after the
+        list. With compact variants enabled the .min.json is written alongside, item by item, and compressed
+        afterwards. Returns the item count; only serialization and writing are timed for the run metrics.
+        """
+        path = get_output_path(filename)
+        tmp = path + '.tmp'
+        min_path = artifact_path(path, 'min')
+        min_tmp = min_path + '.tmp'
+        data = {'schemaVersion': SCHEMA_VERSION, **data}
+        spent = 0.0
+        count = 0
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f, \
+                    (open(min_tmp, 'w', encoding='utf-8') if self.artifacts else nullcontext()) as m:
+                t0 = time.perf_counter()
+                f.write('{\n')
+                for k, v in data.items():
+                    f.write(f"  {json.dumps(k)}: {json.dumps(v, ensure_ascii=False)},\n")
+                f.write(f"  {json.dumps(key)}: [")
+                if m:
+                    m.write(compact(data)[:-1] + f",{json.dumps(key)}:[")
+                spent += time.perf_counter() - t0
+                for item in items:
+                    t0 = time.perf_counter()
+                    f.write((',\n    ' if count else '\n    ') + json.dumps(item, ensure_ascii=False))
+                    if m:
+                        m.write((',' if count else '') + compact(item))
+                    count += 1
+                    spent += time.perf_counter() - t0
+                t0 = time.perf_counter()
+                f.write('\n  ]' if count else ']')
+                if count_key:
+                    f.write(f",\n  {json.dumps(count_key)}: {count}")
+                f.write('\n}\n')
+                if m:
+                    m.write(']' + (f",{json.dumps(count_key)}:{count}" if count_key else '') + '}')
+            os.replace(tmp, path)
+            if self.artifacts:
+                os.replace(min_tmp, min_path)
+            spent += time.perf_counter() - t0
+        except BaseException:
+            for leftover in (tmp, min_tmp):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            raise
+        try:
+            if self.artifacts:
+                self.artifacts.publish_file(path)
+            else:
+                remove_artifacts(path)
+        except OSError as e:
+            print(f"  Failed to write the compact variants of {filename}: {e}")
+        if self.metrics:
+            self.metrics.record_write(self.name or type(self).__name__, filename, spent)
+        return count
+
+
+_WORKER_SCRAPERS: Dict[Tuple[type, str], BaseScraper] = {}
+
+
+def _parse_in_worker(cls: type, backend: str, method: str, text: str, args: tuple) -> Any:
+    scraper = _WORKER_SCRAPERS.get((cls, backend))
+    if scraper is None:
+        scraper = _WORKER_SCRAPERS[(cls, backend)] = cls(backend=backend)
+    return getattr(scraper, method)(text, *args)
+
+
+def make_parse_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    if workers <= 0:
+        return None
+    # Fetch threads are already running when workers start, so avoid a plain fork of this process
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def get_output_path(filename: str) -> str:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    feeds_dir = os.path.join(os.path.dirname(script_dir), 'feeds')
+    os.makedirs(feeds_dir, exist_ok=True)
+    return os.path.join(feeds_dir, filename)
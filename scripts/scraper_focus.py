@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tophub focus scraper (fetch_all.py focus).
+
+Writes realtime-focus.json with the boards picked from each Tophub category
+(tophub.json, --tophub-config) plus the EastMoney headlines.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from parsing import CardSpec, class_regex, has_class, iter_stream_elements, lx_first, lx_text, text_chunks
+from records import NewsItem, parse_count, upgrade
+from scraper import STREAM_CHUNK_SIZE, BaseScraper, get_output_path
+from snapshots import Observation, ranked
+from tophub import DEFAULT_CONFIG as DEFAULT_TOPHUB_CONFIG, label_index, load_categories
+
+
+class TophubScraper(BaseScraper):
+    name = 'focus'
+    default_backend = 'lxml'
+    origins = ('https://tophub.today', 'https://finance.eastmoney.com')
+    card_spec = CardSpec(css='.cc-cd', xpath=f'//*[{has_class("cc-cd")}]', strain_attrs={'class': class_regex('cc-cd')})
+    # Categories and target boards (tophub.json, --tophub-config)
+    config = DEFAULT_TOPHUB_CONFIG
+    # Categories whose sections were carried over from the previous feed in this run
+    stale: Tuple[str, ...] = ()
+
+    @classmethod
+    def configure(cls, args: Any):
+        cls.config = args.tophub_config
+
+    @staticmethod
+    def _soup_text(el, selector: str) -> str:
+        found = el.select_one(selector)
+        return found.get_text(strip=True) if found else ''
+
+    def _parse_category(self, html: str, targets: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        backend = self.backend
+        root = backend.parse(html, self.card_spec)
+        parsed = {t: [] for t in targets}
+        index = label_index(tuple(targets))
+        for card in backend.cards(root, self.card_spec):
+            if backend.kind == 'lxml':
+                label = lx_text(lx_first(card, f'.//*[{has_class("cc-cd-lb")}]'))
+                target = index.match(label)
+                if not target: continue
+                s_title = lx_text(lx_first(card, f'.//*[{has_class("cc-cd-sb-st")}]'))
+                items = []
+                for a in card.xpath(f'.//*[{has_class("cc-cd-cb")}]//a[@href]'):
+                    href = a.get('href', '').strip()
+                    if not (href.startswith('http')): continue
+                    row = lx_first(a, f'.//*[{has_class("cc-cd-cb-ll")}]')
+                    if row is None: continue
+                    items.append(NewsItem(
+                        title=lx_text(lx_first(row, f'.//*[{has_class("t")}]')), url=href,
+                        rank=parse_count(lx_text(lx_first(row, f'.//*[{has_class("s")}]')), None),
+                        extra=lx_text(lx_first(row, f'.//*[{has_class("e")}]')),
+                    ).to_dict())
+                parsed[target].append({'section': s_title, 'items': items})
+                continue
+            target = index.match(self._soup_text(card, '.cc-cd-lb'))
+            if not target: continue
+            s_title = self._soup_text(card, '.cc-cd-sb-st')
+            items = []
+            for a in card.select('.cc-cd-cb a[href]'):
+                href = a.get('href', '').strip()
+                if not (href.startswith('http')): continue
+                row = a.select_one('.cc-cd-cb-ll')
+                if not row: continue
+                items.append(NewsItem(
+                    title=self._soup_text(row, '.t'), url=href, rank=parse_count(self._soup_text(row, '.s'), None),
+                    extra=self._soup_text(row, '.e'),
+                ).to_dict())
+            parsed[target].append({'section': s_title, 'items': items})
+        return parsed
+
+    eastmoney_skip_words = ('查看', '广告', '推广', '合作')
+
+    def _extract_eastmoney(self, chunks: Iterable[Any], limit: int = 30, encoding: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Pull headline links out of the yaowen page as it streams in; stops once limit unique titles are found."""
+        em_items = []
+        seen = set()
+        for a in iter_stream_elements(chunks, 'a', encoding=encoding):
+            href = (a.get('href') or '').strip()
+            if '/a/' not in href: continue
+            title = lx_text(a)
+            a.clear()
+            if not title or len(title) < 6 or any(w in title for w in self.eastmoney_skip_words): continue
+            if href.startswith('/'): href = 'https://finance.eastmoney.com' + href
+            if title not in seen:
+                seen.add(title)
+                em_items.append(NewsItem(title=title, url=href).to_dict())
+                if len(em_items) >= limit: break
+        return em_items
+
+    def _parse_eastmoney(self, html: str, limit: int = 30) -> List[Dict[str, Any]]:
+        return self._extract_eastmoney(text_chunks(html, STREAM_CHUNK_SIZE), limit)
+
+    @staticmethod
+    def _previous_categories() -> Dict[str, Any]:
+        try:
+            with open(get_output_path('realtime-focus.json'), 'r', encoding='utf-8') as f:
+                return upgrade(json.load(f)).get('categories', {})
+        except (OSError, ValueError):
+            return {}
+
+    def observations(self, filename: str, data: Any) -> Iterable[Observation]:
+        """Headline ranks, as "focus/<category>/<board>/<section>"; carried-over categories are not recorded again."""
+        for category, spec in data.get('categories', {}).items():
+            if category in self.stale:
+                continue
+            for board, sections in spec.get('sections', {}).items():
+                for section in sections:
+                    yield from ranked(f"focus/{category}/{board}/{section['section']}", section['items'], rank='rank')
+
+    def run(self):
+        specs = load_categories(self.config)
+        output = {'savedAt': datetime.now().isoformat(), 'categories': {}}
+        em_url = 'https://finance.eastmoney.com/yaowen.html'
+        print(f"Fetching Tophub ({len(specs)} categories, {sum(len(s['targets']) for s in specs.values())} boards) and EastMoney...")
+        # EastMoney first: it is on another host and should not queue behind dozens of Tophub pages
+        jobs = [(self.get_streamed, em_url, self._extract_eastmoney)]
+        jobs += [(self.get_parsed, spec['url'], self._parse_category, spec['targets']) for spec in specs.values()]
+        # A couple of workers beyond the host slots keep tophub.today busy while pages are parsed
+        results = self.map_concurrent(lambda job: job[0](*job[1:]), jobs, max_workers=self.host_limiter.max_per_host * 2 + 1)
+        failed = []
+        for (cat, spec), parsed in zip(specs.items(), results[1:]):
+            if isinstance(parsed, Exception):
+                failed.append(cat)
+                print(f"  Failed {cat}: {parsed}")
+                continue
+            output['categories'][cat] = {'sourceUrl': spec['url'], 'sections': parsed}
+        if len(failed) == len(specs):
+            raise RuntimeError(f"All {len(specs)} Tophub categories failed")
+        self.stale = tuple(failed)
+        if failed:
+            # Keep the last good sections of a category that failed this time
+            previous = self._previous_categories()
+            for cat in failed:
+                if cat in previous:
+                    output['categories'][cat] = previous[cat]
+            output['categories'] = {cat: output['categories'][cat] for cat in specs if cat in output['categories']}
+
+        # EastMoney Integration
+        em_items = results[0]
+        if isinstance(em_items, Exception):
+            print(f"  Warning: EastMoney failed: {em_items}")
+        else:
+            output['categories'].setdefault('finance', {}) \
+                  .setdefault('sections', {})['东方财富网'] = [{'section': '焦点要闻', 'items': em_items}]
+
+        self.write_output('realtime-focus.json', output)
+        print("Saved Tophub Focus data.")
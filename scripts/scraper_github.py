@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+GitHub Trending scraper (fetch_all.py github).
+
+Writes trending-data.json with the daily, weekly and monthly trending
+repositories; with --gh-matrix also every period per programming language and
+per spoken language (see crawl_matrix).
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from parsing import CardSpec, class_regex, has_class, lx_first, lx_text
+from records import Repo, parse_count
+from scraper import BaseScraper
+from snapshots import Observation, ranked
+from workqueue import BudgetExceeded, WorkQueue
+
+# Default --gh-matrix slices: GitHub's trending URL slugs and spoken language codes
+DEFAULT_GH_LANGUAGES = (
+    'python', 'javascript', 'typescript', 'go', 'rust', 'java', 'kotlin', 'swift', 'c', 'c++', 'c#',
+    'php', 'ruby', 'dart', 'scala', 'lua', 'zig', 'shell', 'html', 'css', 'vue', 'jupyter-notebook',
+)
+DEFAULT_GH_SPOKEN = ('zh', 'en', 'ja', 'ko', 'es', 'ru', 'de', 'fr')
+# Seconds a --gh-matrix crawl may take; slices not started by then are skipped
+DEFAULT_GH_BUDGET = 900
+
+
+class GitHubTrendingScraper(BaseScraper):
+    name = 'github'
+    default_backend = 'lxml'
+    origins = ('https://github.com',)
+    card_spec = CardSpec(
+        css='article.Box-row',
+        xpath=f'//article[{has_class("Box-row")}]',
+        strain_name='article', strain_attrs={'class': class_regex('Box-row')})
+
+    def _parse_repo_article(self, article) -> Optional[Dict[str, Any]]:
+        try:
+            if self.backend.kind == 'lxml':
+                repo_link = lx_first(article, f'(.//h2[{has_class("h3")}])[1]//a')
+                repo_name = lx_text(repo_link)
+                repo_href = repo_link.get('href')
+                description_elem = lx_first(article, './/p')
+                language_elem = lx_first(article, './/*[@itemprop="programmingLanguage"]')
+                stars_elem = lx_first(article, './/a[contains(@href, "/stargazers")]')
+                forks_elem = lx_first(article, './/a[contains(@href, "/forks")]')
+                stars_today_elem = lx_first(article, './/span[@class="d-inline-block float-sm-right"]')
+                text = lx_text
+                avatar_imgs = article.xpath(f'.//img[{has_class("avatar")}]')
+            else:
+                repo_link = article.find('h2', class_='h3').find('a')
+                repo_name = repo_link.get_text(strip=True)
+                repo_href = repo_link.get('href')
+                description_elem = article.find('p')
+                language_elem = article.find(attrs={'itemprop': 'programmingLanguage'})
+                stars_elem = article.find('a', href=re.compile(r'/stargazers'))
+                forks_elem = article.find('a', href=re.compile(r'/forks'))
+                stars_today_elem = article.find('span', class_='d-inline-block float-sm-right')
+                text = lambda el: el.get_text(strip=True)
+                avatar_imgs = article.find_all('img', class_='avatar')
+            repo_url = 'https://github.com' + repo_href
+            description = text(description_elem) if description_elem is not None else 'No description available'
+            language = text(language_elem) if language_elem is not None else 'Unknown'
+            built_by = []
+            for img in avatar_imgs[:5]:
+                username = img.get('alt', '').replace('@', '')
+                if username: built_by.append(f"@{username}")
+            
+            return Repo(
+                name=repo_name, url=repo_url, description=description, language=language,
+                stars=parse_count(text(stars_elem) if stars_elem is not None else None),
+                forks=parse_count(text(forks_elem) if forks_elem is not None else None),
+                stars_today=parse_count(text(stars_today_elem) if stars_today_elem is not None else None),
+                built_by=built_by,
+            ).to_dict()
+        except Exception as e:
+            print(f"  Error parsing GitHub repo: {e}")
+            return None
+
+    def _parse_page(self, html: str, limit: Optional[int] = 25) -> List[Dict[str, Any]]:
+        root = self.backend.parse(html, self.card_spec)
+        repos = []
+        for article in self.backend.cards(root, self.card_spec)[:limit]:
+            data = self._parse_repo_article(article)
+            if data: repos.append(data)
+        return repos
+
+    periods = ('daily', 'weekly', 'monthly')
+    # Matrix crawl (--gh-matrix): every period per programming language and per spoken language
+    matrix = False
+    languages: Tuple[str, ...] = DEFAULT_GH_LANGUAGES
+    spoken_languages: Tuple[str, ...] = DEFAULT_GH_SPOKEN
+    budget: float = DEFAULT_GH_BUDGET
+
+    @staticmethod
+    def trending_url(period: str, language: str = '', spoken: str = '') -> str:
+        url = 'https://github.com/trending' + (f"/{quote(language, safe='+')}" if language else '')
+        query = {**({'since': period} if period != 'daily' else {}), **({'spoken_language_code': spoken} if spoken else {})}
+        return f"{url}?{urlencode(query)}" if query else url
+
+    @staticmethod
+    def slug(value: str) -> str:
+        return re.sub(r'[^\w.-]+', '-', value.lower().replace('++', 'pp').replace('#', 'sharp'))
+
+    @classmethod
+    def configure(cls, args: Any):
+        cls.matrix = args.gh_matrix
+        if args.gh_budget is not None:
+            cls.budget = args.gh_budget
+        if args.gh_languages is not None:
+            cls.languages = tuple(v.strip() for v in args.gh_languages.split(',') if v.strip())
+        if args.gh_spoken is not None:
+            cls.spoken_languages = tuple(v.strip() for v in args.gh_spoken.split(',') if v.strip())
+
+    def observations(self, filename: str, data: Any) -> Iterable[Observation]:
+        """Rank, stars, forks and stars gained per period, as "github/<period>", "github/language=<slug>/<period>"
+        or "github/spoken=<code>/<period>"; trending-matrix.json repeats the per-language files and is skipped."""
+        if filename == 'trending-matrix.json':
+            return
+        prefix = ('github/language=' + data['language'] if 'language' in data else
+                  'github/spoken=' + data['spokenLanguage'] if 'spokenLanguage' in data else 'github')
+        for period in self.periods:
+            yield from ranked(f"{prefix}/{period}", data.get(period) or [], ('stars', 'forks', 'starsToday'))
+
+    def run(self):
+        print(f"Fetching GitHub Trending ({', '.join(self.periods)})...")
+        pages = self.map_concurrent(lambda url: self.get_parsed(url, self._parse_page), [self.trending_url(p) for p in self.periods])
+        all_data = {}
+        for period, repos in zip(self.periods, pages):
+            if isinstance(repos, Exception): raise repos
+            all_data[period] = repos
+
+        output = {**all_data, 'lastUpdated': datetime.now().isoformat(), 'totalRepositories': sum(len(r) for r in all_data.values())}
+        self.write_output('trending-data.json', output)
+        print(f"Saved GitHub Trending data. Total: {output['totalRepositories']}")
+        if self.matrix:
+            self.crawl_matrix(all_data)
+
+    def crawl_matrix(self, global_pages: Dict[str, List[Dict[str, Any]]]):
+        """Fetch every (language, spoken language, period) slice through a bounded work queue.
+
+        Repositories seen in several slices are merged into one record listing each membership (slice, rank
+        and stars gained in that period) in trending-matrix.json; every language and spoken language also
+        gets its own trending-language-<slug>.json / trending-spoken-<code>.json shaped like trending-data.json.
+        """
+        slices = [(language, '', period) for language in self.languages for period in self.periods]
+        slices += [('', spoken, period) for spoken in self.spoken_languages for period in self.periods]
+        print(f"Crawling GitHub Trending matrix: {len(self.languages)} languages, {len(self.spoken_languages)} "
+              f"spoken languages, {len(slices)} pages (budget {self.budget:.0f}s)...")
+        repositories: Dict[str, Dict[str, Any]] = {}
+        grouped: Dict[Tuple[str, str], Dict[str, List[Dict[str, Any]]]] = {}
+        status: Dict[Tuple[str, str, str], Any] = {}
+
+        def _merge(slice_, repos):
+            language, spoken, period = slice_
+            for rank, repo in enumerate(repos, 1):
+                record = repositories.setdefault(repo['url'], {k: v for k, v in repo.items() if k != 'starsToday'})
+                record.setdefault('slices', []).append({'language': language or None, 'spokenLanguage': spoken or None,
+                                                        'period': period, 'rank': rank, 'starsToday': repo['starsToday']})
+
+        for period in self.periods:
+            status[('', '', period)] = len(global_pages.get(period, []))
+            _merge(('', '', period), global_pages.get(period, []))
+        # Parsing is the only CPU work per page, so a couple of workers beyond the host slots keep them busy
+        workers = 0 if self.profiler else self.host_limiter.max_per_host * 2
+        queue = WorkQueue(lambda slice_: self.get_parsed(self.trending_url(slice_[2], *slice_[:2]), self._parse_page),
+                          workers, budget=self.budget)
+        for slice_, repos, error in queue.run(slices):
+            status[slice_] = error or len(repos)
+            if error is None:
+                _merge(slice_, repos)
+                grouped.setdefault(slice_[:2], {})[slice_[2]] = repos
+
+        now = datetime.now().isoformat()
+        order = {slice_: n for n, slice_ in enumerate([('', '', p) for p in self.periods] + slices)}
+        for (language, spoken), by_period in grouped.items():
+            filename = f"trending-language-{self.slug(language)}.json" if language else f"trending-spoken-{self.slug(spoken)}.json"
+            key, value = ('language', language) if language else ('spokenLanguage', spoken)
+            # A period that failed this time is left out rather than written empty
+            self.write_output(filename, {key: value, **{p: by_period[p] for p in self.periods if p in by_period},
+                                         'lastUpdated': now,
+                                         'totalRepositories': sum(len(r) for r in by_period.values())})
+        self.write_output('trending-matrix.json', {
+            'lastUpdated': now,
+            'slices': [{'language': language or None, 'spokenLanguage': spoken or None, 'period': period,
+                        **({'repositories': result} if isinstance(result, int) else {'error': str(result)})}
+                       for (language, spoken, period), result in sorted(status.items(), key=lambda kv: order[kv[0]])],
+            'totalRepositories': len(repositories),
+            'repositories': sorted(repositories.values(), key=lambda r: -len(r['slices'])),
+        })
+        skipped = sum(1 for r in status.values() if isinstance(r, BudgetExceeded))
+        failed = sum(1 for r in status.values() if isinstance(r, Exception)) - skipped
+        print(f"Saved GitHub Trending matrix: {len(slices) - failed - skipped}/{len(slices)} pages, "
+              f"{len(repositories)} unique repositories in {len(grouped)} slices"
+              + (f", {failed} failed" if failed else '') + (f", {skipped} skipped (budget)" if skipped else ''))
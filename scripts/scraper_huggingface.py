@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+HuggingFace models scraper (fetch_all.py huggingface).
+
+Writes huggingface-data.json with the top trending, most liked and most
+downloaded models from the /api/models listing, streamed and mapped as the
+JSON arrives; with --hf-leaderboard also one leaderboard file per category
+and slice. The unofficial trending listing is hedged (hedge.py) with the
+recently modified and most liked listings as fallbacks; it is always tried
+first and used whenever it returns models, the fallbacks only fill in.
+"""
+
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from hedge import HedgeStats, hedged
+from parsing import iter_json_array, text_chunks
+from records import Model
+from scraper import STREAM_CHUNK_SIZE, BaseScraper, get_output_path
+from snapshots import Observation, ranked
+
+# Default --hf-slice leaderboards: (listing filter, value)
+DEFAULT_HF_SLICES = (
+    ('pipeline_tag', 'text-generation'), ('pipeline_tag', 'text-to-image'),
+    ('pipeline_tag', 'automatic-speech-recognition'), ('pipeline_tag', 'feature-extraction'),
+    ('library', 'transformers'), ('library', 'diffusers'), ('library', 'gguf'),
+)
+
+
+class HuggingFaceScraper(BaseScraper):
+    name = 'huggingface'
+    origins = ('https://huggingface.co',)
+    api_base = 'https://huggingface.co/api/models'
+    categories = {'trending': {'trending': 'true'}, 'likes': {'sort': 'likes'}, 'downloads': {'sort': 'downloads'}}
+    # Listings tried in place of trending=true when it fails or comes back empty
+    trending_fallbacks = ({'sort': 'lastModified', 'direction': '-1'}, {'sort': 'likes'})
+    # Fields records.Model.from_api reads (cardData holds the description, parameters and fallback tags; listings
+    # have no top-level description); the API then sends only these besides the id
+    api_fields = ('pipeline_tag', 'likes', 'downloads', 'tags', 'cardData')
+    page_size = 1000
+    # Models per category in huggingface-data.json
+    limit = 25
+    # Leaderboards (--hf-leaderboard): models per category, overall and per (filter, value) slice
+    leaderboard_limit = 0
+    leaderboard_slices: Tuple[Tuple[str, str], ...] = DEFAULT_HF_SLICES
+
+    @classmethod
+    def configure(cls, args: Any):
+        slices = []
+        for spec in args.hf_slice:
+            key, sep, value = spec.partition('=')
+            if not sep or not key or not value:
+                raise ValueError(f"invalid --hf-slice '{spec}' (expected FILTER=VALUE)")
+            slices.append((key, value))
+        cls.leaderboard_limit = max(0, args.hf_leaderboard)
+        if slices:
+            cls.leaderboard_slices = tuple(slices)
+
+    def models_url(self, params: Dict[str, str], limit: int) -> str:
+        query = [*params.items(), ('limit', min(limit, self.page_size)), *(('expand[]', f) for f in self.api_fields)]
+        return f"{self.api_base}?{urlencode(query)}"
+
+    def _map_model(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        model = Model.from_api(item)
+        return model.to_dict() if model else None
+
+    def _extract_models(self, chunks: Iterable[Any], limit: Optional[int] = None, encoding: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Map listing items as the JSON array streams in; stops reading once limit models are mapped."""
+        models = []
+        for item in iter_json_array(chunks, encoding=encoding):
+            model = self._map_model(item)
+            if model:
+                models.append(model)
+                if limit is not None and len(models) >= limit: break
+        return models
+
+    def _parse_models(self, text: str, limit: int = 25) -> List[Dict[str, Any]]:
+        return self._extract_models(text_chunks(text, STREAM_CHUNK_SIZE), limit)
+
+    def iter_models(self, params: Dict[str, str], limit: int) -> Iterator[Dict[str, Any]]:
+        """Yield up to limit mapped models, following the listing's pages; only one page is held at a time."""
+        return self.iter_listing(self.models_url(params, limit), limit)
+
+    def iter_listing(self, url: str, limit: int, cancel: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """iter_models() for a listing URL built by models_url(); stops requesting once cancel is set."""
+        remaining = limit
+        pages = self.get_paginated(url, lambda chunks, encoding=None: self._extract_models(chunks, remaining, encoding=encoding),
+                                   cancel=cancel)
+        for models in pages:
+            remaining -= len(models)
+            yield from models
+            if remaining <= 0 or not models: break
+
+    @staticmethod
+    def leaderboard_filename(category: str, slice_: Optional[Tuple[str, str]]) -> str:
+        parts = [category, *(re.sub(r'[^\w.-]+', '-', part) for part in slice_ or ())]
+        return f"huggingface-leaderboard-{'-'.join(parts)}.json"
+
+    def write_leaderboards(self):
+        """Stream each leaderboard straight into its own feed file, so memory does not grow with the limit."""
+        jobs = [(category, slice_) for category in self.categories for slice_ in (None, *self.leaderboard_slices)]
+        print(f"Fetching HuggingFace leaderboards (top {self.leaderboard_limit:,}, {len(jobs)} leaderboards)...")
+
+        def _write(job):
+            category, slice_ = job
+            filters = dict([slice_]) if slice_ else {}
+            header = {'category': category, 'filters': filters, 'lastUpdated': datetime.now().isoformat()}
+            models = self.iter_models({**self.categories[category], **filters}, self.leaderboard_limit)
+            return self.write_output_stream(self.leaderboard_filename(category, slice_), header, 'models', models,
+                                            count_key='totalModels')
+
+        results = self.map_concurrent(_write, jobs, max_workers=self.host_limiter.max_per_host)
+        for (category, slice_), count in zip(jobs, results):
+            label = category + (f" {slice_[0]}={slice_[1]}" if slice_ else '')
+            if isinstance(count, Exception):
+                print(f"  Failed leaderboard {label}: {count}")
+            else:
+                print(f"  Saved leaderboard {label}: {count:,} models")
+
+    def observations(self, filename: str, data: Any) -> Iterable[Observation]:
+        """Rank, likes and downloads per category, as "huggingface/<category>"; leaderboards are streamed and not recorded."""
+        for category in self.categories:
+            yield from ranked(f"huggingface/{category}", data.get(category) or [], ('likes', 'downloads'))
+
+    def top_models(self, category: str) -> List[Dict[str, Any]]:
+        """The first `limit` models of a category; trending is hedged over its fallback listings."""
+        params = self.categories[category]
+        if category != 'trending':
+            return list(self.iter_models(params, self.limit))
+        candidates = [self.models_url(p, self.limit) for p in (params, *self.trending_fallbacks)]
+        stats = HedgeStats()
+        try:
+            # A cancelled candidate makes no further request or retry (its backoff wait ends at once)
+            url, models = hedged(candidates, lambda url, cancel: list(self.iter_listing(url, self.limit, cancel)),
+                                 valid=bool, stats=stats, group=category)
+        finally:
+            stats.save()
+        if url != candidates[0]:
+            print(f"  {category}: using fallback listing {url}")
+        return models
+
+    def run(self):
+        print(f"Fetching HuggingFace Models ({', '.join(self.categories)})...")
+        results = self.map_concurrent(self.top_models, list(self.categories))
+        all_data = {}
+        for cat, models in zip(self.categories, results):
+            if isinstance(models, Exception):
+                print(f"  Failed {cat}: {models}"); models = []
+            all_data[cat] = models
+
+        output = {**all_data, 'lastUpdated': datetime.now().isoformat(), 'totalModels': sum(len(m) for m in all_data.values())}
+        if output['totalModels'] > 0 or not os.path.exists(get_output_path('huggingface-data.json')):
+            self.write_output('huggingface-data.json', output)
+        print(f"Saved HuggingFace Models data. Total: {output['totalModels']}")
+        if self.leaderboard_limit > 0:
+            self.write_leaderboards()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+HuggingFace Papers scraper (fetch_all.py papers).
+
+Writes huggingface-papers-data.json with the daily, weekly, monthly and
+trending paper listings.
+"""
+
+import os
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from parsing import CardSpec, lx_text
+from records import Paper
+from scraper import BaseScraper, get_output_path
+from snapshots import Observation, ranked
+
+
+class HFPapersScraper(BaseScraper):
+    name = 'papers'
+    default_backend = 'lxml'
+    origins = ('https://huggingface.co',)
+    card_spec = CardSpec(
+        css='article, div[data-testid="paper-card"]',
+        xpath='//article | //div[@data-testid="paper-card"]',
+        strain_name=['article', 'div', 'li'])
+    list_spec = CardSpec(css='li', xpath='//li', strain_name=['article', 'div', 'li'])
+    org_href = re.compile(r'^/[^/?#]+$')
+    author_count = re.compile(r'(\d+)\s+authors?\b')
+
+    def _extract_card(self, card) -> Optional[Dict[str, Any]]:
+        """Read one paper card in a single walk over its descendants."""
+        lxml_tree = self.backend.kind == 'lxml'
+        if lxml_tree:
+            nodes = (el for el in card.iterdescendants() if isinstance(el.tag, str))
+            name_of, text_of = (lambda el: el.tag), lx_text
+            own_text = lambda el: el.text or ''
+            classes = lambda el: (el.get('class') or '').split()
+        else:
+            nodes = card.find_all(True)
+            name_of, text_of = (lambda el: el.name), (lambda el: el.get_text(strip=True))
+            own_text = lambda el: ''.join(el.find_all(string=True, recursive=False))
+            classes = lambda el: el.get('class') or []
+        link = title = abstract = organization = None
+        upvotes = total_authors = None
+        authors: List[str] = []
+        for el in nodes:
+            tag = name_of(el)
+            if tag == 'a':
+                href = el.get('href', '')
+                if link is None and href.startswith('/papers/'):
+                    link = el
+                elif organization is None and self.org_href.match(href):
+                    organization = text_of(el) or None
+            elif tag in ('h2', 'h3'):
+                if title is None: title = text_of(el)
+            elif tag == 'li':
+                if el.get('title'): authors.append(el.get('title'))
+            elif tag == 'p':
+                if abstract is None: abstract = text_of(el)
+            elif upvotes is None and 'leading-none' in classes(el):
+                digits = re.sub(r'[^\d]', '', text_of(el))
+                if digits: upvotes = int(digits)
+            elif total_authors is None:
+                m = self.author_count.search(own_text(el))
+                if m: total_authors = int(m.group(1))
+        if link is None:
+            return None
+        title = title or link.get('title') or text_of(link)
+        if not title:
+            return None
+        href = link.get('href', '')
+        if authors:
+            author_line = ', '.join(authors) + (' et al.' if (total_authors or 0) > len(authors) else '')
+        else:
+            author_line = 'Unknown'
+        return Paper(title=title, url=f"https://huggingface.co{href}" if href.startswith('/') else href, authors=author_line,
+                     abstract=(abstract or 'No abstract available.')[:240], upvotes=upvotes or 0,
+                     organization=organization).to_dict()
+
+    def _parse_papers(self, html: str, limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        backend = self.backend
+        root = backend.parse(html, self.card_spec)
+        lxml_tree = backend.kind == 'lxml'
+        parents = (lambda el: el.iterancestors()) if lxml_tree else (lambda el: el.parents)
+        items = []
+        seen_urls = set()
+        for spec in (self.card_spec, self.list_spec):
+            # Cards come in document order, so an enclosing card is always visited before the ones nested in it
+            visited = set()
+            for card in backend.cards(root, spec):
+                visited.add(id(card))
+                if any(id(p) in visited for p in parents(card)): continue
+                paper = self._extract_card(card)
+                if paper is None or paper['url'] in seen_urls: continue
+                seen_urls.add(paper['url'])
+                items.append(paper)
+                if limit is not None and len(items) >= limit: return items
+            if items: return items
+
+        # Fallback: bare /papers/ links
+        full = root if not getattr(backend, 'strained', False) else backend.parse(html)
+        anchors = full.xpath('//a[starts-with(@href, "/papers/")]') if lxml_tree else full.select('a[href^="/papers/"]')
+        for a in anchors:
+            href = a.get('href', ''); url = f"https://huggingface.co{href}" if href.startswith('/') else href
+            title = a.get('title') or (lx_text(a) if lxml_tree else a.get_text(strip=True))
+            if title and url not in seen_urls:
+                seen_urls.add(url)
+                items.append(Paper(title=title, url=url).to_dict())
+        return items[:limit]
+
+    def observations(self, filename: str, data: Any) -> Iterable[Observation]:
+        """Rank and upvotes per listing, as "papers/<listing>"."""
+        for listing in data.get('totals', {}):
+            yield from ranked(f"papers/{listing}", data[listing], ('upvotes',))
+
+    def run(self):
+        today = date.today()
+        year, week_num, _ = today.isocalendar()
+        print(f"Fetching HuggingFace Papers...")
+        payload = {}
+        targets = {
+            'daily': f"https://huggingface.co/papers/date/{today.strftime('%Y-%m-%d')}",
+            'weekly': f"https://huggingface.co/papers/week/{year}-W{week_num:02d}",
+            'monthly': f"https://huggingface.co/papers/month/{today.year}-{today.month:02d}",
+            'trending': "https://huggingface.co/papers/trending"
+        }
+        results = self.map_concurrent(lambda url: self.get_parsed(url, self._parse_papers), list(targets.values()))
+        for key, papers in zip(targets, results):
+            if isinstance(papers, Exception):
+                print(f"  Failed {key}: {papers}"); papers = []
+            payload[key] = papers
+        
+        payload['lastUpdated'] = datetime.now().isoformat()
+        payload['totals'] = {k: len(v) for k, v in payload.items() if isinstance(v, list)}
+        if sum(payload['totals'].values()) > 0 or not os.path.exists(get_output_path('huggingface-papers-data.json')):
+            self.write_output('huggingface-papers-data.json', payload)
+        print(f"Saved HuggingFace Papers data. Total: {sum(payload['totals'].values())}")
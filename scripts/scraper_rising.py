@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Rising lists stage of fetch_all.py (see analytics.py).
+
+Runs after the scrapers, once this run's snapshots are in the store, and
+writes feeds/rising-<group>.json through write_output so the lists get
+deltas and run metrics like any other feed. It is not a CLI target.
+"""
+
+from analytics import DEFAULT_RISING_LIMIT, rising_feeds
+from scraper import BaseScraper
+
+
+class RisingFeeds(BaseScraper):
+    name = 'rising'
+    # Items per rising list (--rising)
+    limit = DEFAULT_RISING_LIMIT
+
+    def run(self):
+        if self.snapshots is None or self.snapshots.run_id is None:
+            return
+        feeds = rising_feeds(self.snapshots, self.limit)
+        for filename, data in feeds:
+            self.write_output(filename, data)
+        print("Saved rising lists: " + (', '.join(f"{data['feed']} {len(data['items'])} of {data['totalTracked']:,}"
+                                                  for _, data in feeds) or 'no earlier run to compare with'))
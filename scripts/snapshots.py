@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Time-series snapshot store for the scraped rankings.
+
+Every feed written through BaseScraper.write_output is also reduced to
+numeric observations, (source, item id, metric, value), by the scraper's
+observations() method and appended to a SQLite database
+(.cache/snapshots/snapshots.sqlite by default), so the history of star counts,
+downloads, upvotes and Tophub ranks can be queried without replaying git:
+
+  runs      (id, at)                       one row per fetch_all.py run
+  sources   (id, name)                     e.g. "github/daily", "focus/finance/雪球/热榜"
+  captures  (source, run)                  the runs that recorded each source
+  series    (id, source, item, metric)     e.g. (github/daily, https://github.com/..., stars)
+  points    (series, run, value)           keyed by (series, run)
+
+history() looks the series up through its unique index and then walks the
+last N captures of its source backwards, so answering "value of X over the
+last N runs" reads about N index entries however many runs are stored. An
+item missing from one of those runs (it dropped off the list) comes back as
+None for that run.
+
+The store only lives as long as its file. In CI the workflow keeps it as the
+snapshots.sqlite.gz asset of the "snapshots" release rather than in
+actions/cache, which evicts entries after 7 days without access; a missing
+file simply starts a new history (run #1), and analytics.py publishes no
+rising lists until a second run has been recorded.
+
+Usage:
+  python3 scripts/snapshots.py sources
+  python3 scripts/snapshots.py items github/daily
+  python3 scripts/snapshots.py history github/daily https://github.com/owner/repo stars --runs 60
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'snapshots',
+                                     'snapshots.sqlite')
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, at TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sources (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS captures (source INTEGER NOT NULL, run INTEGER NOT NULL, PRIMARY KEY (source, run)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS series (id INTEGER PRIMARY KEY, source INTEGER NOT NULL, item TEXT NOT NULL, metric TEXT NOT NULL,
+                                   UNIQUE (source, item, metric));
+CREATE TABLE IF NOT EXISTS points (series INTEGER NOT NULL, run INTEGER NOT NULL, value NUMERIC,
+                                   PRIMARY KEY (series, run)) WITHOUT ROWID;
+"""
+# (source, item id, metric, value)
+Observation = Tuple[str, str, str, Union[int, float]]
+# "1,234", "12.5万" and the like
+NUMBER_RE = re.compile(r'\s*([+-]?\d[\d,]*(?:\.\d+)?)\s*(万|亿)?\s*')
+UNITS = {'万': 10 ** 4, '亿': 10 ** 8}
+
+
+def number(value: Any) -> Optional[Union[int, float]]:
+    """A feed value as a number ("1,234" -> 1234, "12.5万" -> 125000), or None when it is not one."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    m = NUMBER_RE.fullmatch(value) if isinstance(value, str) else None
+    if not m:
+        return None
+    result = float(m.group(1).replace(',', '')) * UNITS.get(m.group(2), 1)
+    return int(result) if result.is_integer() else result
+
+
+def ranked(source: str, items: Iterable[Dict[str, Any]], metrics: Sequence[str] = (), key: str = 'url',
+           rank: Optional[str] = None) -> Iterator[Observation]:
+    """Observations of a ranked list: each item's rank (its rank field if numeric, else its position) and metrics."""
+    for position, item in enumerate(items, 1):
+        item_id = item.get(key) if isinstance(item, dict) else None
+        if not isinstance(item_id, str) or not item_id:
+            continue
+        yield source, item_id, 'rank', (number(item.get(rank)) if rank else None) or position
+        for metric in metrics:
+            value = number(item.get(metric))
+            if value is not None:
+                yield source, item_id, metric, value
+
+
+class SnapshotStore:
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Scrapers record from their own threads; every statement runs under the lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.run_id: Optional[int] = None
+        self.recorded = 0
+        self.sources_recorded: Set[str] = set()
+        with self._lock, self._db:
+            version = self._db.execute('PRAGMA user_version').fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise sqlite3.DatabaseError(f"{path} has schema version {version}, newer than {SCHEMA_VERSION}")
+            self._db.executescript(SCHEMA)
+            self._db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _source_id(self, name: str, create: bool = False) -> Optional[int]:
+        if create:
+            self._db.execute('INSERT OR IGNORE INTO sources (name) VALUES (?)', (name,))
+        row = self._db.execute('SELECT id FROM sources WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def record(self, observations: Iterable[Observation]) -> int:
+        """Append observations to this run (started on the first call); returns how many were stored.
+
+        Every source named in observations counts as captured in this run. An item id seen twice in one source
+        keeps its first value, i.e. its best rank.
+        """
+        by_source: Dict[str, List[Tuple[str, str, Union[int, float]]]] = {}
+        for source, item, metric, value in observations:
+            by_source.setdefault(source, []).append((item, metric, value))
+        if not by_source:
+            return 0
+        with self._lock, self._db:
+            if self.run_id is None:
+                self.run_id = self._db.execute('INSERT INTO runs (at) VALUES (?)', (datetime.now().isoformat(),)).lastrowid
+            count = 0
+            for source, rows in by_source.items():
+                source_id = self._source_id(source, create=True)
+                self._db.execute('INSERT OR IGNORE INTO captures (source, run) VALUES (?, ?)', (source_id, self.run_id))
+                self._db.executemany('INSERT OR IGNORE INTO series (source, item, metric) VALUES (?, ?, ?)',
+                                     ((source_id, item, metric) for item, metric, _ in rows))
+                count += self._db.executemany(
+                    'INSERT OR IGNORE INTO points (series, run, value) '
+                    'SELECT id, ?, ? FROM series WHERE source = ? AND item = ? AND metric = ?',
+                    ((self.run_id, value, source_id, item, metric) for item, metric, value in rows)).rowcount
+            self.recorded += count
+            self.sources_recorded.update(by_source)
+        return count
+
+    def history(self, source: str, item: str, metric: str, runs: int = 30) -> List[Tuple[str, Optional[Union[int, float]]]]:
+        """(run time, value) of item's metric in the last `runs` runs that captured source, oldest first.
+
+        The value is None for a run in which the item was not in the source's list.
+        """
+        with self._lock:
+            source_id = self._source_id(source)
+            if source_id is None:
+                return []
+            series = self._db.execute('SELECT id FROM series WHERE source = ? AND item = ? AND metric = ?',
+                                      (source_id, item, metric)).fetchone()
+            rows = self._db.execute(
+                'SELECT runs.at, points.value FROM captures JOIN runs ON runs.id = captures.run '
+                'LEFT JOIN points ON points.series = ? AND points.run = captures.run '
+                'WHERE captures.source = ? ORDER BY captures.run DESC LIMIT ?',
+                (series[0] if series else None, source_id, runs)).fetchall()
+        return rows[::-1]
+
+    def sources(self) -> List[str]:
+        with self._lock:
+            return [name for name, in self._db.execute('SELECT name FROM sources ORDER BY name')]
+
+    def latest(self, source: str, metric: str = 'rank') -> List[Tuple[str, Union[int, float]]]:
+        """(item, value) of metric in the most recent run that captured source, ordered by value."""
+        with self._lock:
+            source_id = self._source_id(source)
+            if source_id is None:
+                return []
+            return self._db.execute(
+                'SELECT series.item, points.value FROM series JOIN points ON points.series = series.id '
+                'WHERE series.source = ? AND series.metric = ? '
+                'AND points.run = (SELECT MAX(run) FROM captures WHERE source = ?) ORDER BY points.value',
+                (source_id, metric, source_id)).fetchall()
+
+    def _group_ids(self, group: str) -> List[int]:
+        """Ids of the sources named group or group/..."""
+        return [source_id for source_id, in self._db.execute(
+            'SELECT id FROM sources WHERE name = ? OR substr(name, 1, ?) = ?', (group, len(group) + 1, group + '/'))]
+
+    def group_runs(self, group: str, until: Optional[int] = None, limit: int = 3) -> List[Tuple[int, str]]:
+        """(run id, run time) of the last `limit` runs up to `until` that captured any source of group, newest first."""
+        with self._lock:
+            ids = self._group_ids(group)
+            if not ids:
+                return []
+            return self._db.execute(
+                f"SELECT runs.id, runs.at FROM runs WHERE runs.id IN (SELECT run FROM captures "
+                f"WHERE source IN ({','.join('?' * len(ids))}) AND run <= ?) ORDER BY runs.id DESC LIMIT ?",
+                (*ids, until if until is not None else self.run_id or 2 ** 62, limit)).fetchall()
+
+    def group_values(self, group: str, metric: str, run: int) -> List[Tuple[str, Union[int, float]]]:
+        """(item, value) of metric in every source of group in one run; an item in several sources appears once per source."""
+        with self._lock:
+            ids = self._group_ids(group)
+            if not ids:
+                return []
+            return self._db.execute(
+                f"SELECT series.item, points.value FROM series JOIN points ON points.series = series.id AND points.run = ? "
+                f"WHERE series.source IN ({','.join('?' * len(ids))}) AND series.metric = ?",
+                (run, *ids, metric)).fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the snapshot store")
+    parser.add_argument('--db', default=DEFAULT_SNAPSHOT_PATH, help="Snapshot database (default: .cache/snapshots/snapshots.sqlite)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('sources', help="List the recorded sources")
+    items = commands.add_parser('items', help="Items of a source in its latest run, by metric")
+    items.add_argument('source')
+    items.add_argument('--metric', default='rank')
+    history = commands.add_parser('history', help="Value of an item's metric over the last N runs")
+    history.add_argument('source')
+    history.add_argument('item')
+    history.add_argument('metric')
+    history.add_argument('--runs', type=int, default=30)
+    args = parser.parse_args()
+    if not os.path.exists(args.db):
+        parser.error(f"no snapshot database at {args.db}")
+    store = SnapshotStore(args.db)
+    try:
+        if args.command == 'sources':
+            for name in store.sources():
+                print(name)
+        elif args.command == 'items':
+            for item, value in store.latest(args.source, args.metric):
+                print(f"{value:>14,}  {item}")
+        else:
+            for at, value in store.history(args.source, args.item, args.metric, args.runs):
+                print(f"{at}  {'-' if value is None else f'{value:,}'}")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import copy
+import hashlib
+import json
+import os
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from delta import ID_KEYS, apply, checksum, diff
+
+SCRIPT_JS = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'script.js')
+
+
+def _items(rnd, ids):
+    return [{'url': url, 'stars': rnd.randint(0, 3),
+             'builtBy': [{'url': f"u{rnd.randint(0, 5)}", 'n': rnd.randint(0, 2)} for _ in range(rnd.randint(0, 3))]}
+            for url in ids]
+
+
+def random_pairs(seed, count):
+    """(old, new) feeds: id-keyed lists (with repeated ids) and Tophub-like sections, often only slightly changed."""
+    rnd = random.Random(seed)
+    for _ in range(count):
+        pool = [f"https://example.com/{i}" for i in range(rnd.randint(1, 30))] + ['dup'] * 3
+        old = {'repos': _items(rnd, rnd.sample(pool, rnd.randint(0, min(12, len(pool))))), 'flag': rnd.randint(0, 1),
+               'sections': [{'section': s, 'items': _items(rnd, rnd.sample(pool, 3))} for s in ('热榜', '要闻')]}
+        new = {'repos': _items(rnd, rnd.sample(pool, rnd.randint(0, min(12, len(pool))))), 'added': [1, 2],
+               'sections': [{'section': s, 'items': _items(rnd, rnd.sample(pool, 3))} for s in ('要闻', '热榜', '快讯')]}
+        if rnd.random() < 0.5:
+            new['repos'] = copy.deepcopy(old['repos'])
+            if rnd.random() < 0.3:
+                rnd.shuffle(new['repos'])
+            if new['repos'] and rnd.random() < 0.5:
+                del new['repos'][rnd.randrange(len(new['repos']))]
+            if new['repos']:
+                new['repos'][rnd.randrange(len(new['repos']))]['stars'] += 1
+        yield old, new
+
+
+def roundtrip(value):
+    return json.loads(json.dumps(value))
+
+
+def test_unchanged_feed_has_no_ops():
+    feed = {'repos': [{'url': 'a', 'stars': 1}], 'lastUpdated': 'x'}
+    assert diff(feed, copy.deepcopy(feed)) == []
+
+
+def test_changed_field_is_addressed_by_id():
+    old = {'repos': [{'url': 'a', 'stars': 1}, {'url': 'b', 'stars': 2}]}
+    new = {'repos': [{'url': 'a', 'stars': 1}, {'url': 'b', 'stars': 3}]}
+    assert diff(old, new) == [{'op': 'set', 'path': ['repos', 'b', 'stars'], 'value': 3}]
+
+
+def test_shift_is_not_a_move():
+    old = [{'url': f"u{i}"} for i in range(10)]
+    new = old[2:] + [{'url': 'x'}, {'url': 'y'}]
+    ops = diff(old, new)
+    assert all(not op.get('moved') for op in ops)
+    assert apply(roundtrip(old), roundtrip(ops)) == new
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_apply_reverses_diff(seed):
+    for old, new in random_pairs(seed, 250):
+        ops = roundtrip(diff(old, new))
+        assert apply(roundtrip(old), ops) == new, (old, new, ops)
+
+
+def test_checksum_is_sha1_of_utf8():
+    # script.js feedChecksum hashes the TextEncoder (UTF-8) bytes of the text
+    assert checksum('中文') == hashlib.sha1('中文'.encode('utf-8')).hexdigest()
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs node")
+def test_script_js_applies_deltas_like_python():
+    with open(SCRIPT_JS, 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('function feedItemIds(')
+    end = source.index('\n}\n', source.index('function applyFeedDelta(')) + 3
+    driver = source[start:end] + '''
+let input = '';
+process.stdin.on('data', chunk => { input += chunk; });
+process.stdin.on('end', () => {
+    const cases = JSON.parse(input);
+    process.stdout.write(JSON.stringify(cases.map(c => applyFeedDelta(c.data, c.ops, c.idKeys))));
+});
+'''
+    cases = [{'data': old, 'ops': diff(old, new), 'idKeys': list(ID_KEYS)} for old, new in random_pairs(7, 300)]
+    expected = [new for _, new in random_pairs(7, 300)]
+    out = subprocess.run(['node', '-e', driver], input=json.dumps(cases), capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout) == roundtrip(expected)
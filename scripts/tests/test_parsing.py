@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from parsing import iter_json_array, text_chunks
+
+DOCUMENTS = [
+    '[]',
+    '[12345]',
+    ' [ {"a": 1} , {"b": "中文"} ] ',
+    '[1, 2.5, -3e2, true, null, "a,]b", {"x": [1, {"y": "}"}]}, [], "\\"[\\""]',
+    json.dumps([{'id': f'org/model-{i}', 'likes': i, 'tags': ['文本', 'b']} for i in range(50)], ensure_ascii=False),
+]
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 100000])
+def test_text_chunks(document, size):
+    assert list(iter_json_array(text_chunks(document, size))) == json.loads(document)
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('size', [1, 2, 5, 13])
+def test_byte_chunks_split_inside_characters(document, size):
+    data = document.encode('utf-8')
+    chunks = (data[i:i + size] for i in range(0, len(data), size))
+    assert list(iter_json_array(chunks)) == json.loads(document)
+
+
+def test_other_encoding():
+    data = '[{"name": "中文"}]'.encode('gbk')
+    assert list(iter_json_array([data[:9], data[9:]], encoding='gbk')) == [{'name': '中文'}]
+
+
+def test_stops_reading_when_iteration_stops():
+    read = []
+
+    def chunks():
+        for piece in ('[1,', '2,', '3,', '4]'):
+            read.append(piece)
+            yield piece
+
+    items = iter_json_array(chunks())
+    assert next(items) == 1
+    assert read == ['[1,']
+
+
+@pytest.mark.parametrize('document', ['[1, 2', '{"a": 1}', '[{"a": 1}', '[1 2]', '[,1]', '[1,,2]', '[1,]'])
+def test_malformed(document):
+    with pytest.raises(ValueError):
+        list(iter_json_array(text_chunks(document, 3)))
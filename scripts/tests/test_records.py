@@ -0,0 +1,26 @@
+import pytest
+
+from records import parse_count
+
+
+@pytest.mark.parametrize('value, expected', [
+    (1234, 1234),
+    (12.9, 12),
+    ('1234', 1234),
+    ('1,234', 1234),
+    ('1,234 stars today', 1234),
+    ('  56 ', 56),
+    ('', 0),
+    ('n/a', 0),
+    (None, 0),
+    (True, 0),
+    (False, 0),
+])
+def test_parse_count(value, expected):
+    assert parse_count(value) == expected
+
+
+def test_parse_count_default():
+    assert parse_count('unknown', default=None) is None
+    assert parse_count(None, default=-1) == -1
+    assert parse_count('7', default=None) == 7
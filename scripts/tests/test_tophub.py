@@ -0,0 +1,40 @@
+import random
+
+from tophub import LabelIndex
+
+
+def naive(targets, label):
+    return next((t for t in dict.fromkeys(targets) if t and t in label), None)
+
+
+def test_declared_order_wins_over_position():
+    index = LabelIndex(['雪球', '财经', '第一财经'])
+    # 第一财经 appears first in the label, but 财经 is declared earlier
+    assert index.match('第一财经 · 雪球热榜') == '雪球'
+    assert index.match('第一财经 日报') == '财经'
+    assert index.match('华尔街见闻') is None
+
+
+def test_overlapping_targets():
+    index = LabelIndex(['abcd', 'bc', 'c'])
+    assert index.match('xabcx') == 'bc'
+    assert index.match('abcd') == 'abcd'
+    assert index.match('xxcx') == 'c'
+
+
+def test_empty_and_duplicate_targets():
+    index = LabelIndex(['', 'a', 'a'])
+    assert index.targets == ['a']
+    assert index.match('') is None
+    assert LabelIndex([]).match('anything') is None
+
+
+def test_matches_naive_scan():
+    rnd = random.Random(0)
+    alphabet = 'abc财经'
+    for _ in range(2000):
+        targets = [''.join(rnd.choices(alphabet, k=rnd.randint(1, 4))) for _ in range(rnd.randint(0, 8))]
+        index = LabelIndex(targets)
+        for _ in range(5):
+            label = ''.join(rnd.choices(alphabet, k=rnd.randint(0, 12)))
+            assert index.match(label) == naive(targets, label), (targets, label)
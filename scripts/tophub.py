@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tophub category config and board-label matching.
+
+Categories and the boards wanted from each come from a JSON file (tophub.json
+next to this module by default) shared by fetch_all.py and fetch_tophub_all.py:
+
+  {"categories": {"finance": {"url": "https://tophub.today/c/finance",
+                              "targets": ["第一财经", "雪球"]}, ...}}
+
+"url" may be left out for https://tophub.today/c/<category>.
+
+A card belongs to the first target, in declared order, that occurs in its
+label. LabelIndex answers that with an Aho–Corasick automaton over all
+targets, so matching a label costs time proportional to the label's length
+however many targets a category lists.
+"""
+
+import json
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tophub.json')
+CATEGORY_URL = 'https://tophub.today/c/{}'
+
+
+def load_categories(path: str = DEFAULT_CONFIG) -> Dict[str, Dict[str, Any]]:
+    """{category: {'url': ..., 'targets': [...]}} from the config file; raises ValueError when it is malformed."""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    categories = config.get('categories') if isinstance(config, dict) else None
+    if not isinstance(categories, dict) or not categories:
+        raise ValueError(f"{path}: expected a non-empty \"categories\" object")
+    specs = {}
+    for name, spec in categories.items():
+        targets = spec.get('targets') if isinstance(spec, dict) else None
+        if not isinstance(targets, list) or not targets or not all(isinstance(t, str) and t for t in targets):
+            raise ValueError(f"{path}: category '{name}' needs a non-empty list of target names")
+        specs[name] = {'url': spec.get('url') or CATEGORY_URL.format(name), 'targets': targets}
+    return specs
+
+
+class LabelIndex:
+    def __init__(self, targets: Iterable[str]):
+        self.targets = list(dict.fromkeys(t for t in targets if t))
+        # Trie transitions, failure links and, per state, the best (lowest) target position ending there
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail = [0]
+        self._best: List[Optional[int]] = [None]
+        for position, target in enumerate(self.targets):
+            state = 0
+            for ch in target:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = self._goto[state][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                state = nxt
+            if self._best[state] is None:
+                self._best[state] = position
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                inherited = self._best[self._fail[nxt]]
+                if inherited is not None and (self._best[nxt] is None or inherited < self._best[nxt]):
+                    self._best[nxt] = inherited
+                queue.append(nxt)
+
+    def match(self, label: str) -> Optional[str]:
+        """The first declared target contained in label, like next(t for t in targets if t in label, None)."""
+        goto, fail, best = self._goto, self._fail, self._best
+        state = 0
+        found: Optional[int] = None
+        for ch in label:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            position = best[state]
+            if position is not None and (found is None or position < found):
+                found = position
+                if found == 0:
+                    break
+        return self.targets[found] if found is not None else None
+
+
+@lru_cache(maxsize=256)
+def label_index(targets: Tuple[str, ...]) -> LabelIndex:
+    """Shared, prebuilt index per target list (also reused across calls inside parse worker processes)."""
+    return LabelIndex(targets)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Pluggable HTTP transports for BaseScraper.
+
+- live:   pass requests straight through to the network
+- record: pass through and save every response as a gzip-compressed,
+          HAR-like entry in a fixture directory
+- replay: serve responses from the fixture directory without touching the
+          network; BaseScraper skips rate limiting, retries and sleeps
+
+Fixture layout: one <sha1 of "METHOD url">.json.gz file per request, holding
+a single HAR-style entry ({startedDateTime, time, request, response}) with the
+body base64-encoded under response.content.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'http')
+MODES = ('live', 'record', 'replay')
+
+
+class ReplayMiss(requests.ConnectionError):
+    """No recorded response exists for the requested URL."""
+
+
+class Transport:
+    mode = 'live'
+    offline = False
+
+    def send(self, session: requests.Session, url: str, headers: Optional[Dict[str, str]] = None,
+             timeout: float = 30, stream: bool = False) -> requests.Response:
+        return session.get(url, timeout=timeout, headers=headers, stream=stream)
+
+
+def fixture_path(directory: str, url: str, method: str = 'GET') -> str:
+    key = hashlib.sha1(f"{method} {url}".encode('utf-8')).hexdigest()
+    return os.path.join(directory, f"{key}.json.gz")
+
+
+class RecordingTransport(Transport):
+    mode = 'record'
+
+    def __init__(self, directory: str = DEFAULT_FIXTURE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, session, url, headers=None, timeout=30, stream=False):
+        # Recording needs the whole body, so streamed requests are read in full here
+        started = datetime.now(timezone.utc)
+        t0 = time.perf_counter()
+        resp = super().send(session, url, headers=headers, timeout=timeout)
+        entry = {
+            'startedDateTime': started.isoformat(),
+            'time': round((time.perf_counter() - t0) * 1000, 3),
+            'request': {
+                'method': 'GET', 'url': url,
+                'headers': [{'name': k, 'value': v} for k, v in (headers or {}).items()],
+            },
+            'response': {
+                'status': resp.status_code,
+                'statusText': resp.reason or '',
+                'headers': [{'name': k, 'value': v} for k, v in resp.headers.items()
+                            if k.lower() not in ('content-encoding', 'transfer-encoding', 'content-length')],
+                'content': {
+                    'size': len(resp.content),
+                    'mimeType': resp.headers.get('Content-Type', ''),
+                    'encoding': 'base64',
+                    'text': base64.b64encode(resp.content).decode('ascii'),
+                },
+            },
+        }
+        path = fixture_path(self.directory, url)
+        tmp = path + '.tmp'
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return resp
+
+
+class ReplayTransport(Transport):
+    mode = 'replay'
+    offline = True
+
+    def __init__(self, directory: str = DEFAULT_FIXTURE_DIR):
+        self.directory = directory
+
+    def send(self, session, url, headers=None, timeout=30, stream=False):
+        path = fixture_path(self.directory, url)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            raise ReplayMiss(f"No recorded response for {url} in {self.directory}")
+        recorded = entry['response']
+        resp = requests.Response()
+        resp.url = url
+        resp.status_code = recorded['status']
+        resp.reason = recorded.get('statusText', '')
+        resp.headers = CaseInsensitiveDict({h['name']: h['value'] for h in recorded['headers']})
+        resp._content = base64.b64decode(recorded['content']['text'])
+        resp._content_consumed = True
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        return resp
+
+
+def make_transport(mode: str, directory: str = DEFAULT_FIXTURE_DIR) -> Transport:
+    if mode == 'record':
+        return RecordingTransport(directory)
+    if mode == 'replay':
+        return ReplayTransport(directory)
+    return Transport()
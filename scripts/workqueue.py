@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Bounded concurrent work queue for crawls of many pages.
+
+WorkQueue.run() hands items to a fixed number of worker threads through a
+queue holding at most `backlog` waiting items, so a crawl of hundreds of
+pages never has more than workers + backlog of them in flight or queued, and
+yields each result as soon as it is done so the caller can merge it and let
+it go. Once the deadline has passed no further item is started: the rest
+come back with a BudgetExceeded error instead of a result.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+_DONE = object()
+
+
+class BudgetExceeded(Exception):
+    """The item was not started because the crawl's time budget ran out."""
+
+
+class WorkQueue:
+    def __init__(self, fn: Callable[[Any], Any], workers: int, backlog: Optional[int] = None,
+                 budget: Optional[float] = None):
+        """workers=0 runs every item in the calling thread (e.g. under the profiler); budget is in seconds."""
+        self.fn = fn
+        self.workers = max(0, workers)
+        self.backlog = backlog if backlog is not None else max(1, self.workers) * 2
+        self.deadline = time.monotonic() + budget if budget is not None else None
+
+    def _call(self, item: Any) -> Tuple[Any, Any, Optional[BaseException]]:
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return item, None, BudgetExceeded(f"Time budget exceeded before {item!r}")
+        try:
+            return item, self.fn(item), None
+        except Exception as e:
+            return item, None, e
+
+    def run(self, items: Iterable[Any]) -> Iterator[Tuple[Any, Any, Optional[BaseException]]]:
+        """Yield (item, result, error) for every item, in completion order."""
+        if not self.workers:
+            for item in items:
+                yield self._call(item)
+            return
+        pending: queue.Queue = queue.Queue(maxsize=self.backlog)
+        done: queue.Queue = queue.Queue()
+        stop = threading.Event()
+
+        def _put(q: queue.Queue, value: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _feed():
+            try:
+                for item in items:
+                    if not _put(pending, item):
+                        return
+            finally:
+                for _ in range(self.workers):
+                    _put(pending, _DONE)
+
+        def _work():
+            try:
+                while not stop.is_set():
+                    try:
+                        item = pending.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if item is _DONE:
+                        return
+                    done.put(self._call(item))
+            finally:
+                done.put(_DONE)
+
+        threads = [threading.Thread(target=_feed, daemon=True)]
+        threads += [threading.Thread(target=_work, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            running = self.workers
+            while running:
+                result = done.get()
+                if result is _DONE:
+                    running -= 1
+                else:
+                    yield result
+        finally:
+            # The caller stopped early: let the workers finish their current item and exit
+            stop.set()